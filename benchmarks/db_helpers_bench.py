@@ -0,0 +1,275 @@
+"""
+Micro-benchmarks for every helper in database/mongo.py, with regression baselines.
+
+Runs on the in-memory backend, seeded with a realistic users collection, and
+records ops/sec + latency percentiles per helper. With --save the results become
+the baseline; otherwise they're compared against it and the script exits 1 when
+a helper's p50 got slower than --threshold (default 25%).
+
+Writes that would drift the fixture (brawler unlocks/upgrades, blacklist and
+hacked-user tags, session lifecycle) are timed as round trips that put the
+document back each iteration, so every op takes the same code path.
+Only ping_database/ensure_indexes (boot-only) are left out.
+
+Baselines are machine-specific, so they aren't committed: benchmarks/results/ is
+gitignored. To get one, run with --save on the commit you want to compare
+against (e.g. `git stash` or check out main), then re-run without --save on
+your change. Use the same --users and machine for both runs.
+
+Usage:
+    python benchmarks/db_helpers_bench.py --users 10000 --save
+    python benchmarks/db_helpers_bench.py --users 10000             # compare
+    python benchmarks/db_helpers_bench.py --only get_user_rank --iterations 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Must be set before database.mongo is imported
+os.environ.setdefault("DB_BACKEND", "memory")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "results", "db_helpers_baseline.json")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def seed(m, users: int, rng: random.Random):
+    """Fills users/quests/payouts/blacklist/tourney/translation collections at the requested size."""
+    docs = []
+    for i in range(users):
+        docs.append({
+            "_id": str(100_000 + i),
+            "balance": rng.randint(0, 50_000),
+            "level": rng.randint(1, 60),
+            "exp": rng.randint(0, 5_000),
+            "currencies": {"coins": rng.randint(0, 20_000), "power_points": rng.randint(0, 5_000),
+                           "credits": rng.randint(0, 2_000), "gems": 0},
+            "brawlers": {"shelly": {"level": rng.randint(1, 11), "gadgets": [], "star_powers": []}},
+        })
+    await m.db.users.insert_many(docs)
+
+    from features.quests import DEFAULT_QUESTS
+    await m.init_default_quests(DEFAULT_QUESTS)
+    for _ in range(20):
+        await m.add_payout_batch(5.0, [str(100_000 + rng.randrange(users)) for _ in range(50)], "seed")
+    for i in range(min(users, 500)):
+        alts = [str(900_000 + i * 2), str(900_000 + i * 2 + 1)]
+        await m.add_blacklisted_user(str(100_000 + i), "seed", "0", alts=alts)
+    for i in range(1_000):
+        await m.save_cached_translation(f"seed:{i}", f"translated {i}")
+    for i in range(min(users, 100)):
+        await m.add_hacked_user(str(100_000 + i))
+    return await m.create_tourney_session()
+
+
+def build_cases(m, users: int, session_id, batch_ids: list[str], rng: random.Random):
+    """Helper name -> zero-arg coroutine factory (one call = one op)."""
+    from features.quests import DEFAULT_QUESTS
+
+    def uid():
+        return str(100_000 + rng.randrange(users))
+
+    async def unlock_brawler():
+        # Drop the brawler first so every call takes the "new" path
+        user_id = uid()
+        await m.db.users.update_one({"_id": user_id}, {"$unset": {"brawlers.bench_brawler": ""}})
+        await m.add_brawler_to_user(user_id, "bench_brawler")
+
+    async def upgrade_brawler():
+        # Level 1 with enough PP/coins, so every call completes an upgrade
+        user_id = uid()
+        await m.db.users.update_one({"_id": user_id}, {"$set": {
+            "brawlers.shelly.level": 1, "currencies.power_points": 5_000, "currencies.coins": 10_000,
+        }})
+        await m.upgrade_brawler_level(user_id, "shelly")
+
+    async def hacked_round_trip():
+        user_id = str(700_000 + rng.randrange(1_000))
+        await m.add_hacked_user(user_id, "bench")
+        await m.remove_hacked_user(user_id)
+
+    async def session_lifecycle():
+        # Leaves only the seeded session active (get_active_tourney_session stays valid)
+        new_id = await m.create_tourney_session()
+        await m.end_tourney_session(new_id)
+        await m.db.tourney_sessions.delete_one({"_id": new_id})
+
+    async def blacklist_round_trip():
+        # add + remove keeps the collection at its seeded size across iterations
+        user_id = str(800_000 + rng.randrange(1_000))
+        await m.add_blacklisted_user(user_id, "bench", "0", alts=[uid()])
+        await m.remove_blacklisted_user(user_id)
+
+    return {
+        # User reads
+        "get_user_data": lambda: m.get_user_data(uid()),
+        "get_user_balance": lambda: m.get_user_balance(uid()),
+        "get_leveling_data": lambda: m.get_leveling_data(uid()),
+        "get_user_brawlers": lambda: m.get_user_brawlers(uid()),
+        "get_brawl_currencies": lambda: m.get_brawl_currencies(uid()),
+        "get_setting": lambda: m.get_setting(f"last_message_{uid()}"),
+        # Balance / XP writes
+        "update_user_balance": lambda: m.update_user_balance(uid(), rng.randint(0, 50_000)),
+        "update_leveling_data": lambda: m.update_leveling_data(uid(), rng.randint(1, 60), rng.randint(0, 5_000)),
+        "set_setting": lambda: m.set_setting(f"last_message_{uid()}", str(time.time())),
+        "add_brawl_coins": lambda: m.add_brawl_coins(uid(), 10),
+        "add_power_points": lambda: m.add_power_points(uid(), 10),
+        "add_brawl_gems": lambda: m.add_brawl_gems(uid(), 1),
+        "add_credits": lambda: m.add_credits(uid(), 10),
+        "deduct_credits": lambda: m.deduct_credits(uid(), 1),
+        "deduct_coins": lambda: m.deduct_coins(uid(), 1),
+        # Inventory tokens
+        "add_item_token": lambda: m.add_item_token(uid(), "bench_token"),
+        "get_item_count": lambda: m.get_item_count(uid(), "bench_token"),
+        "remove_item_token": lambda: m.remove_item_token(uid(), "bench_token"),
+        # Brawler collection writes
+        "add_brawler_to_user(new)": unlock_brawler,
+        "add_brawler_to_user(duplicate)": lambda: m.add_brawler_to_user(uid(), "shelly"),
+        "upgrade_brawler_level": upgrade_brawler,
+        "add_gadget_to_user": lambda: m.add_gadget_to_user(uid(), "shelly", "Fast Forward"),
+        "add_star_power_to_user": lambda: m.add_star_power_to_user(uid(), "shelly", "Shell Shock"),
+        "add_hypercharge_to_user": lambda: m.add_hypercharge_to_user(uid(), "shelly", "Double Barrel"),
+        # Rank queries + leaderboards
+        "get_total_users": lambda: m.get_total_users(),
+        "get_user_rank": lambda: m.get_user_rank(uid()),
+        "get_user_level_rank": lambda: m.get_user_level_rank(uid()),
+        "get_leaderboard_page": lambda: m.get_leaderboard_page(rng.randrange(0, 100) * 10, 10),
+        "get_levels_page": lambda: m.get_levels_page(rng.randrange(0, 100) * 10, 10),
+        # Quests
+        "init_default_quests": lambda: m.init_default_quests(DEFAULT_QUESTS),
+        "assign_random_quest": lambda: m.assign_random_quest(uid(), rng.choice(["daily", "weekly"])),
+        "get_active_quest": lambda: m.get_active_quest(uid(), "daily"),
+        "update_quest_progress": lambda: m.update_quest_progress(uid(), "daily"),
+        # Payouts
+        "add_payout_batch": lambda: m.add_payout_batch(1.0, [uid() for _ in range(5)], "bench"),
+        "get_user_unpaid_batches": lambda: m.get_user_unpaid_batches(uid()),
+        "get_all_pending_payouts": lambda: m.get_all_pending_payouts(),
+        "get_payout_logs": lambda: m.get_payout_logs(25),
+        "get_unpaid_recipients": lambda: m.get_unpaid_recipients(rng.sample(batch_ids, min(5, len(batch_ids)))),
+        "clear_pending_payout": lambda: m.clear_pending_payout(uid()),
+        # Blacklist
+        "get_blacklisted_user": lambda: m.get_blacklisted_user(str(100_000 + rng.randrange(min(users, 1_000)))),
+        "get_all_blacklisted_users": lambda: m.get_all_blacklisted_users(),
+        "add_remove_blacklisted_user": blacklist_round_trip,
+        # Hacked-user tags
+        "get_hacked_users": lambda: m.get_hacked_users(),
+        "add_remove_hacked_user": hacked_round_trip,
+        # Tourney counters
+        "increment_tourney_message_count": lambda: m.increment_tourney_message_count(session_id),
+        "update_tourney_queue": lambda: m.update_tourney_queue(session_id, rng.choice([1, -1])),
+        "increment_staff_closure": lambda: m.increment_staff_closure(session_id, uid(), "bench"),
+        "get_active_tourney_session": lambda: m.get_active_tourney_session(),
+        "create_end_tourney_session": session_lifecycle,
+        "get_top_staff_stats": lambda: m.get_top_staff_stats(session_id),
+        # Translation cache
+        "get_cached_translation": lambda: m.get_cached_translation(f"seed:{rng.randrange(2_000)}"),
+        "save_cached_translation": lambda: m.save_cached_translation(f"bench:{rng.randrange(1_000)}", "x"),
+    }
+
+
+async def measure(factory, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        await factory()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        await factory()
+        samples.append(time.perf_counter() - t)
+    elapsed = time.perf_counter() - start
+    return {
+        "ops_per_sec": iterations / elapsed,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "mean_ms": statistics.mean(samples) * 1000,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        floor = 0.01  # ignore sub-10µs noise
+        if current["p50_ms"] > max(previous["p50_ms"], floor) * (1 + threshold):
+            regressions.append(
+                f"{name}: p50 {previous['p50_ms']:.3f}ms -> {current['p50_ms']:.3f}ms "
+                f"(+{(current['p50_ms'] / max(previous['p50_ms'], floor) - 1):.0%})"
+            )
+    return regressions
+
+
+async def run(args) -> int:
+    import database.mongo as m
+
+    rng = random.Random(args.seed)
+    print(f"🌱 Seeding {args.users:,} users...")
+    session_id = await seed(m, args.users, rng)
+    batch_ids = [log["batch_id"] for log in await m.get_payout_logs(100)]
+
+    cases = build_cases(m, args.users, session_id, batch_ids, rng)
+    if args.only:
+        cases = {k: v for k, v in cases.items() if k in args.only}
+
+    results = {}
+    print(f"{'helper':<34}{'ops/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for name, factory in cases.items():
+        result = results[name] = await measure(factory, args.iterations, args.warmup)
+        print(f"{name:<34}{result['ops_per_sec']:>10.0f}{result['p50_ms']:>9.3f}"
+              f"{result['p95_ms']:>9.3f}{result['p99_ms']:>9.3f}")
+
+    key = f"users={args.users}"
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+
+    if args.save:
+        stored[key] = results
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline saved to {args.baseline} [{key}]")
+        return 0
+
+    if key not in stored:
+        print(f"ℹ️ No baseline for {key} yet (run with --save).")
+        return 0
+
+    regressions = compare(results, stored[key], args.threshold)
+    if regressions:
+        print(f"❌ {len(regressions)} helper(s) regressed more than {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print(f"✅ No helper regressed more than {args.threshold:.0%} vs baseline [{key}]")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p50 slowdown (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--only", nargs="*", help="Only run these helpers")
+    parser.add_argument("--seed", type=int, default=7)
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Language detection latency: cold vs warm langdetect, and the script fast path.
+
+Usage:
+    python benchmarks/detect_bench.py --rounds 200
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLES = [
+    "hello everyone, good luck in the tournament",
+    "hola a todos, buena suerte",
+    "bonjour tout le monde",
+    "Привет всем, удачи",
+    "こんにちは、みなさん",
+    "大家好，祝你好运",
+    "안녕하세요 여러분",
+    "สวัสดีทุกคน",
+    "Γειά σας σε όλους",
+    "שלום לכולם",
+    "வணக்கம் அனைவருக்கும்",
+    "नमस्ते सब लोग",
+]
+
+COLD_SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from langdetect import detect; detect('hello everyone'); "
+    "print(time.perf_counter() - t)"
+)
+
+
+def cold_start_ms() -> float:
+    """First detect() in a fresh interpreter (what the first user used to pay)."""
+    out = subprocess.run([sys.executable, "-c", COLD_SNIPPET], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+def time_per_call_us(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in SAMPLES:
+            func(text)
+    return (time.perf_counter() - start) / (rounds * len(SAMPLES)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    from features.translation_backends import GoogleBackend, quick_detect
+
+    backend = GoogleBackend()
+    cold = cold_start_ms()
+
+    start = time.perf_counter()
+    backend.warm_up()
+    warm_up = (time.perf_counter() - start) * 1000
+
+    def with_fast_path(text):
+        return quick_detect(text) or backend.detect(text)
+
+    full = time_per_call_us(backend.detect, args.rounds)
+    fast = time_per_call_us(with_fast_path, args.rounds)
+    hits = sum(1 for text in SAMPLES if quick_detect(text))
+
+    stable = all(len({backend.detect(text) for _ in range(5)}) == 1 for text in SAMPLES)
+
+    print(f"cold first detect:      {cold:8.1f} ms (fresh process, before)")
+    print(f"warm_up() at cog load:  {warm_up:8.1f} ms (background, after)")
+    print(f"langdetect per call:    {full:8.1f} us")
+    print(f"fast path + fallback:   {fast:8.1f} us ({hits}/{len(SAMPLES)} samples skip langdetect)")
+    print(f"deterministic results:  {stable}")
+    print(f"mean speedup:           {full / fast:8.2f}x")
+    print("samples:", ", ".join(f"{with_fast_path(t)}" for t in SAMPLES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Synthetic gateway load: how many messages/sec can the on_message listeners absorb?
+
+Loads every cog + the tourney system on the in-memory DB backend, fabricates
+messages from N users across M channels (some of them tourney tickets), and
+dispatches each one to every registered on_message listener the way discord.py
+does (one task per listener), at a fixed rate or as fast as possible.
+
+Usage:
+    python benchmarks/gateway_load.py --messages 5000 --users 200 --channels 20 --rate 200
+    MEMORY_DB_LATENCY_MS=2 python benchmarks/gateway_load.py --rate 0
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+# Must be set before database.mongo is imported
+os.environ.setdefault("DB_BACKEND", "memory")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+
+from database.instrumentation import get_stats, reset_stats
+from features.config import TOURNEY_CATEGORY_ID
+
+
+class BenchChannel(discord.TextChannel):
+    """TextChannel that passes isinstance checks but never touches the API."""
+
+    def __init__(self, channel_id: int, name: str, category_id: int = None):
+        self.id = channel_id
+        self.name = name
+        self.category_id = category_id
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+
+class BenchUser:
+    bot = False
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.roles = []
+        self.display_name = f"user{user_id}"
+
+    @property
+    def mention(self):
+        return f"<@{self.id}>"
+
+
+class BenchMessage:
+    guild = None
+
+    def __init__(self, author: BenchUser, channel: BenchChannel, content: str):
+        self.author = author
+        self.channel = channel
+        self.content = content
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(args):
+    import main
+    from database.mongo import create_tourney_session
+    from features.readiness import ALL_GATES
+    from features.tourney.tourney_session import flush_message_count, set_active_session
+
+    for gate in ALL_GATES:
+        gate.set()
+    await main.load_features()
+    listeners = list(main.bot.extra_events.get("on_message", []))
+    print(f"🎯 Driving {len(listeners)} on_message listeners")
+
+    # Active session so the tourney ticket counter does real writes
+    set_active_session(await create_tourney_session())
+
+    users = [BenchUser(10_000 + i) for i in range(args.users)]
+    channels = []
+    for i in range(args.channels):
+        if i < args.channels * args.ticket_share:
+            channels.append(BenchChannel(20_000 + i, f"ticket-{i:04d}", TOURNEY_CATEGORY_ID))
+        else:
+            channels.append(BenchChannel(20_000 + i, f"general-{i}"))
+
+    rng = random.Random(args.seed)
+    messages = [
+        BenchMessage(rng.choice(users), rng.choice(channels), f"benchmark message {i}")
+        for i in range(args.messages)
+    ]
+
+    reset_stats()
+    latencies = []
+    in_flight = 0
+    peak_in_flight = 0
+
+    async def deliver(message):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        start = time.perf_counter()
+        await asyncio.gather(*(listener(message) for listener in listeners), return_exceptions=True)
+        latencies.append(time.perf_counter() - start)
+        in_flight -= 1
+
+    # Cog loops started during load never finish; only drain work the messages spawned.
+    # The tourney cogs are added from tasks, so give those a moment to start their loops.
+    await asyncio.sleep(0.1)
+    preexisting = asyncio.all_tasks()
+    wall_start = time.perf_counter()
+    tasks = []
+    interval = 1 / args.rate if args.rate > 0 else 0
+    for i, message in enumerate(messages):
+        tasks.append(asyncio.create_task(deliver(message)))
+        if interval:
+            # Pace against the schedule, not the previous send, so lag shows up as backlog
+            delay = wall_start + (i + 1) * interval - time.perf_counter()
+            await asyncio.sleep(max(0, delay))
+        elif i % 100 == 0:
+            await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    # Clock stops when the last message's listeners finish
+    wall = time.perf_counter() - wall_start
+
+    # Let fire-and-forget work finish before counting DB calls (reported separately)
+    drain_start = time.perf_counter()
+    pending = [
+        t for t in asyncio.all_tasks()
+        if t not in preexisting and t not in tasks and not t.done()
+    ]
+    if pending:
+        await asyncio.wait(pending, timeout=2)
+    await flush_message_count()
+    drain = time.perf_counter() - drain_start
+
+    db_calls = sum(s.calls for s in get_stats().values())
+    ms = [x * 1000 for x in latencies]
+    print(f"messages={len(ms)} users={args.users} channels={args.channels} "
+          f"target_rate={'max' if not args.rate else args.rate}/s")
+    print(f"throughput: {len(ms) / wall:.1f} msg/s over {wall:.2f}s (peak in-flight {peak_in_flight})")
+    print(f"drain: {drain:.2f}s for {len(pending)} background task(s) after the last message")
+    print(f"latency ms: p50={percentile(ms, 50):.2f} p95={percentile(ms, 95):.2f} "
+          f"p99={percentile(ms, 99):.2f} max={max(ms):.2f} mean={statistics.mean(ms):.2f}")
+    print(f"db calls: {db_calls} total, {db_calls / len(ms):.2f} per message")
+    top = sorted(get_stats().values(), key=lambda s: s.calls, reverse=True)[:8]
+    for s in top:
+        print(f"   {s.name:<32} {s.calls:>7} calls  p95 {s.percentile(95) * 1000:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--channels", type=int, default=20)
+    parser.add_argument("--ticket-share", type=float, default=0.25, help="Fraction of channels that are tourney tickets")
+    parser.add_argument("--rate", type=float, default=0, help="Messages per second (0 = as fast as possible)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    async def runner():
+        await run(args)
+        os._exit(0)  # skip tearing down cog background loops
+
+    asyncio.run(runner())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Load test for /translate using the offline local backend.
+
+Fires concurrent /translate calls through the real cog callback with fake
+interactions, then reports command latency and how saturated the translation
+thread pool got while they ran. With --batch-size, the same phrases are then
+sent through translate_many() in batches (one backend call per batch's cache
+misses) and compared with one call per phrase.
+
+Usage:
+    python benchmarks/translation_bench.py --requests 500 --concurrency 50 --latency-ms 150
+    python benchmarks/translation_bench.py --requests 500 --unique 200 --batch-size 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Must be set before the cog/config are imported
+os.environ.setdefault("TRANSLATION_BACKEND", "local")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeResponse:
+    async def defer(self, *args, **kwargs):
+        pass
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+
+class FakeAvatar:
+    url = "https://cdn.discordapp.com/embed/avatars/0.png"
+
+
+class FakeUser:
+    display_name = "bench-user"
+    display_avatar = FakeAvatar()
+
+
+class FakeInteraction:
+    def __init__(self):
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
+        self.user = FakeUser()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def sample_executor(executor, samples: list, stop: asyncio.Event):
+    """Records the translation pool's queue depth every 5ms while the load runs."""
+    while not stop.is_set():
+        samples.append(executor.queue_depth)
+        await asyncio.sleep(0.005)
+
+
+async def run(args):
+    from features.translation import Translation
+    from features.translation_backends import LocalBackend, TranslationExecutor
+
+    executor = TranslationExecutor(args.workers, args.max_queue, args.timeout)
+    cog = Translation(bot=None, backend=LocalBackend(args.latency_ms), executor=executor)
+    callback = Translation.translate_slash.callback
+    languages = ["es", "fr", "de", "hi", "ja"]
+
+    latencies = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(i):
+        phrase = f"benchmark phrase {i % args.unique}"
+        interaction = FakeInteraction()
+        async with semaphore:
+            start = time.perf_counter()
+            await callback(cog, interaction, languages[i % len(languages)], phrase)
+            latencies.append(time.perf_counter() - start)
+
+    samples = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_executor(executor, samples, stop))
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    wall = time.perf_counter() - wall_start
+
+    stop.set()
+    await sampler
+    executor.shutdown()
+
+    ms = [x * 1000 for x in latencies]
+    queued = samples or [0]
+    print(f"backend=local latency={args.latency_ms}ms workers={args.workers} "
+          f"concurrency={args.concurrency} unique={args.unique}")
+    print(f"requests: {len(ms)} in {wall:.2f}s ({len(ms) / wall:.1f} req/s)")
+    print(f"latency ms: p50={percentile(ms, 50):.1f} p95={percentile(ms, 95):.1f} "
+          f"p99={percentile(ms, 99):.1f} max={max(ms):.1f} mean={statistics.mean(ms):.1f}")
+    print(f"executor queue: max={max(queued)} mean={statistics.mean(queued):.1f} "
+          f"saturated={sum(1 for q in queued if q > 0) / len(queued):.0%} of samples")
+    print(f"executor stats: {executor.stats()}")
+    print(f"cache: hits={cog.cache.hits} misses={cog.cache.misses} size={len(cog.cache)}")
+
+    if args.batch_size:
+        await run_batches(args)
+
+
+async def run_batches(args):
+    """translate_many() vs one translate_text() per phrase, each on a fresh cog and pool."""
+    from features.translation import Translation
+    from features.translation_backends import LocalBackend, TranslationExecutor
+
+    phrases = [f"batch phrase {i % args.unique}" for i in range(args.requests)]
+    batches = [phrases[i:i + args.batch_size] for i in range(0, len(phrases), args.batch_size)]
+
+    for label in ("single", "batched"):
+        executor = TranslationExecutor(args.workers, args.max_queue, args.timeout)
+        cog = Translation(bot=None, backend=LocalBackend(args.latency_ms), executor=executor)
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one_batch(batch):
+            async with semaphore:
+                if label == "batched":
+                    return await cog.translate_many("en", "es", batch)
+                return [await cog.translate_text("en", "es", text) for text in batch]
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_batch(batch) for batch in batches))
+        wall = time.perf_counter() - start
+        executor.shutdown()
+        print(f"{label:<8} {len(phrases)} phrases in {len(batches)} batches of {args.batch_size}: "
+              f"{wall:.2f}s, backend calls={executor.submitted}, cache hits={cog.cache.hits}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=10**6)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--unique", type=int, default=10**9, help="Distinct phrases (lower = more cache hits)")
+    parser.add_argument("--batch-size", type=int, default=0, help="Also compare translate_many() batches of this size")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
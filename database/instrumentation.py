@@ -0,0 +1,241 @@
+import contextvars
+import functools
+import inspect
+import os
+import time
+from collections import deque
+
+# Helpers slower than this (ms) are logged with the filter shape of every query they ran
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "250"))
+# Latency samples kept per helper for the percentiles
+SAMPLE_SIZE = 1024
+
+
+
+class HelperCall:
+    """Queries issued by the running helper, and whether any of them failed."""
+    __slots__ = ("queries", "failed")
+
+    def __init__(self):
+        self.queries: list[str] = []
+        self.failed = False
+
+
+# The helper call currently running (per asyncio task)
+_current_call: contextvars.ContextVar = contextvars.ContextVar("db_current_call", default=None)
+
+
+class HelperStats:
+    """Call count, error count and a rolling window of latencies for one helper."""
+    __slots__ = ("name", "calls", "errors", "total", "max", "samples")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def record(self, elapsed: float, failed: bool):
+        self.calls += 1
+        self.errors += failed
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.samples.append(elapsed)
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def summary(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": (self.total / self.calls * 1000) if self.calls else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+HELPER_STATS: dict[str, HelperStats] = {}
+
+
+def get_stats() -> dict[str, HelperStats]:
+    return HELPER_STATS
+
+def _stats_for(name: str) -> HelperStats:
+    # Looked up per call so reset_stats() really starts every helper from zero
+    stats = HELPER_STATS.get(name)
+    if stats is None:
+        stats = HELPER_STATS[name] = HelperStats(name)
+    return stats
+
+def reset_stats():
+    HELPER_STATS.clear()
+
+
+def filter_shape(value):
+    """Replaces every literal in a filter/update with '?' so queries group by shape."""
+    if isinstance(value, dict):
+        return {k: filter_shape(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [filter_shape(value[0])] if value else []
+    return "?"
+
+
+# --- HELPER DECORATOR ---
+
+def instrument(func):
+    """Times an async DB helper and logs it (with its queries) when it runs slow."""
+    name = func.__name__
+    _stats_for(name)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        call = HelperCall()
+        token = _current_call.set(call)
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            call.failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_call.reset(token)
+            # call.failed is also set when the helper swallowed a failed query
+            _stats_for(name).record(elapsed, call.failed)
+            if elapsed * 1000 >= SLOW_QUERY_MS:
+                shapes = "; ".join(call.queries) or "no queries"
+                print(f"🐢 Slow DB helper {name}: {elapsed * 1000:.0f}ms — {shapes}")
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+def instrument_module(namespace: dict, module_name: str):
+    """Wraps every async function defined in `module_name` (call at the end of the module)."""
+    for attr, value in list(namespace.items()):
+        if (
+            inspect.iscoroutinefunction(value)
+            and value.__module__ == module_name
+            and not getattr(value, "__instrumented__", False)
+        ):
+            namespace[attr] = instrument(value)
+
+
+# --- COLLECTION PROXY ---
+
+# Collection methods whose first argument is a filter (or pipeline / list of ops)
+QUERY_METHODS = {
+    "find", "find_one", "find_one_and_update", "find_one_and_delete", "find_one_and_replace",
+    "update_one", "update_many", "replace_one", "delete_one", "delete_many",
+    "count_documents", "distinct", "aggregate", "insert_one", "insert_many", "bulk_write",
+}
+
+
+async def _tracked(awaitable, call: HelperCall):
+    try:
+        return await awaitable
+    except Exception:
+        call.failed = True
+        raise
+
+
+class InstrumentedCursor:
+    """Wraps a Motor cursor so failures while fetching count against the running helper."""
+
+    def __init__(self, cursor, call: HelperCall):
+        self._cursor = cursor
+        self._call = call
+
+    def __getattr__(self, attr):
+        target = getattr(self._cursor, attr)
+        if not callable(target):
+            return target
+
+        def method(*args, **kwargs):
+            result = target(*args, **kwargs)
+            if result is self._cursor:  # sort/skip/limit chain
+                return self
+            if inspect.isawaitable(result):
+                return _tracked(result, self._call)
+            return result
+        return method
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        try:
+            async for doc in self._cursor:
+                yield doc
+        except Exception:
+            self._call.failed = True
+            raise
+
+
+class InstrumentedCollection:
+    """Wraps a Motor collection and records the shape of each query into the running helper."""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, attr):
+        target = getattr(self._collection, attr)
+        if attr not in QUERY_METHODS:
+            return target
+
+        collection_name = self._collection.name
+
+        def call(*args, **kwargs):
+            helper_call = _current_call.get()
+            if helper_call is None:
+                return target(*args, **kwargs)
+
+            first = args[0] if args else kwargs.get("filter", {})
+            if attr in ("insert_one", "insert_many", "bulk_write"):
+                shape = f"{len(first)} docs" if isinstance(first, list) else "1 doc"
+            else:
+                shape = filter_shape(first)
+            helper_call.queries.append(f"{collection_name}.{attr}({shape})")
+
+            try:
+                result = target(*args, **kwargs)
+            except Exception:
+                helper_call.failed = True
+                raise
+            if inspect.isawaitable(result):
+                return _tracked(result, helper_call)
+            if attr in ("find", "aggregate"):
+                return InstrumentedCursor(result, helper_call)
+            return result
+        return call
+
+
+class InstrumentedDatabase:
+    """Wraps a Motor database so every collection it hands out is instrumented."""
+
+    def __init__(self, database):
+        self._database = database
+        self._collections: dict[str, InstrumentedCollection] = {}
+
+    def _wrap(self, name: str) -> InstrumentedCollection:
+        if name not in self._collections:
+            self._collections[name] = InstrumentedCollection(self._database[name])
+        return self._collections[name]
+
+    def __getitem__(self, name: str):
+        return self._wrap(name)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_"):
+            return getattr(self._database, attr)
+        # Motor: db.<name> is a collection unless it's a real Database attribute
+        if hasattr(type(self._database), attr):
+            return getattr(self._database, attr)
+        return self._wrap(attr)
@@ -0,0 +1,493 @@
+"""
+In-memory stand-in for the Motor client (DB_BACKEND=memory).
+
+Covers the subset of the MongoDB API that database/mongo.py uses, so the bot
+and the benchmarks can run offline. Data lives only as long as the process.
+"""
+import asyncio
+import copy
+import os
+from dataclasses import dataclass, field
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+
+_MISSING = object()
+
+# Optional simulated round-trip per operation, so benchmarks see realistic interleaving
+LATENCY = float(os.getenv("MEMORY_DB_LATENCY_MS", "0")) / 1000
+
+async def _round_trip():
+    await asyncio.sleep(LATENCY)
+
+
+# --- RESULTS (same attribute names as pymongo.results) ---
+
+@dataclass
+class InsertOneResult:
+    inserted_id: object
+    acknowledged: bool = True
+
+@dataclass
+class UpdateResult:
+    matched_count: int = 0
+    modified_count: int = 0
+    upserted_id: object = None
+    acknowledged: bool = True
+
+@dataclass
+class DeleteResult:
+    deleted_count: int = 0
+    acknowledged: bool = True
+
+@dataclass
+class BulkWriteResult:
+    inserted_count: int = 0
+    matched_count: int = 0
+    modified_count: int = 0
+    deleted_count: int = 0
+    upserted_count: int = 0
+    upserted_ids: dict = field(default_factory=dict)
+    acknowledged: bool = True
+
+
+# --- DOTTED PATHS ---
+
+def get_path(doc, path: str):
+    """Reads 'a.b.0.c' style paths. Returns _MISSING if any part is absent."""
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part, _MISSING)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+def set_path(doc: dict, path: str, value):
+    parts = path.split(".")
+    target = doc
+    for part in parts[:-1]:
+        if isinstance(target, list) and part.isdigit():
+            target = target[int(part)]
+        else:
+            target = target.setdefault(part, {})
+    if isinstance(target, list) and parts[-1].isdigit():
+        target[int(parts[-1])] = value
+    else:
+        target[parts[-1]] = value
+
+def unset_path(doc: dict, path: str):
+    parts = path.split(".")
+    target = get_path(doc, ".".join(parts[:-1])) if len(parts) > 1 else doc
+    if isinstance(target, dict):
+        target.pop(parts[-1], None)
+
+
+# --- QUERY MATCHING ---
+
+def _compare(op: str, value, arg) -> bool:
+    if op == "$exists":
+        return (value is not _MISSING) == bool(arg)
+    if op == "$in":
+        if isinstance(value, list):
+            return any(v in arg for v in value)
+        return (None if value is _MISSING else value) in arg
+    if op == "$nin":
+        return not _compare("$in", value, arg)
+    if op == "$ne":
+        return not _compare("$eq", value, arg)
+    if op == "$eq":
+        if isinstance(value, list) and not isinstance(arg, list):
+            return arg in value
+        return (None if value is _MISSING else value) == arg
+
+    if value is _MISSING or value is None:
+        return False
+    try:
+        if op == "$gt": return value > arg
+        if op == "$gte": return value >= arg
+        if op == "$lt": return value < arg
+        if op == "$lte": return value <= arg
+    except TypeError:
+        return False
+    raise NotImplementedError(f"Memory backend: query operator {op} not supported")
+
+def matches(doc: dict, query: dict) -> bool:
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(doc, sub) for sub in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(doc, sub) for sub in condition):
+                return False
+        else:
+            value = get_path(doc, key)
+            if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+                if not all(_compare(op, value, arg) for op, arg in condition.items()):
+                    return False
+            elif not _compare("$eq", value, condition):
+                return False
+    return True
+
+
+# --- UPDATES ---
+
+def evaluate(doc: dict, expr):
+    """Evaluates an aggregation expression (pipeline updates) against doc."""
+    if isinstance(expr, str) and expr.startswith("$") and not expr.startswith("$$"):
+        value = get_path(doc, expr[1:])
+        return None if value is _MISSING else value
+    if isinstance(expr, list):
+        return [evaluate(doc, item) for item in expr]
+    if not isinstance(expr, dict):
+        return expr
+    if len(expr) == 1 and next(iter(expr)).startswith("$"):
+        op, args = next(iter(expr.items()))
+        if op == "$literal":
+            return args
+        args = [evaluate(doc, a) for a in (args if isinstance(args, list) else [args])]
+        present = [a for a in args if a is not None]
+        if op == "$ifNull":
+            return present[0] if present else None
+        if op == "$max":
+            return max(present) if present else None
+        if op == "$min":
+            return min(present) if present else None
+        if op == "$add":
+            return sum(args) if len(present) == len(args) else None
+        if op == "$subtract":
+            return args[0] - args[1] if len(present) == 2 else None
+        raise NotImplementedError(f"Memory backend: expression operator {op} not supported")
+    # Expression object -> embedded document
+    return {key: evaluate(doc, value) for key, value in expr.items()}
+
+def _apply_pipeline(doc: dict, pipeline: list):
+    for stage in pipeline:
+        for op, spec in stage.items():
+            if op in ("$set", "$addFields"):
+                # Every field in a stage sees the stage's input document
+                values = [(path, evaluate(doc, expr)) for path, expr in spec.items()]
+                for path, value in values:
+                    set_path(doc, path, value)
+            elif op == "$unset":
+                for path in [spec] if isinstance(spec, str) else spec:
+                    unset_path(doc, path)
+            else:
+                raise NotImplementedError(f"Memory backend: pipeline stage {op} not supported")
+
+def apply_update(doc: dict, update, inserting: bool = False) -> bool:
+    """Applies an update document (or update pipeline) in place. Returns True if anything changed."""
+    before = copy.deepcopy(doc)
+
+    if isinstance(update, list):
+        _apply_pipeline(doc, update)
+        return doc != before
+
+    if not any(k.startswith("$") for k in update):
+        # Replacement document
+        _id = doc.get("_id")
+        doc.clear()
+        doc.update(copy.deepcopy(update))
+        if _id is not None:
+            doc["_id"] = _id
+        return doc != before
+
+    for op, fields in update.items():
+        for path, arg in fields.items():
+            current = get_path(doc, path)
+            if op == "$set":
+                set_path(doc, path, copy.deepcopy(arg))
+            elif op == "$setOnInsert":
+                if inserting:
+                    set_path(doc, path, copy.deepcopy(arg))
+            elif op == "$unset":
+                unset_path(doc, path)
+            elif op == "$inc":
+                set_path(doc, path, (0 if current is _MISSING else current) + arg)
+            elif op == "$max":
+                if current is _MISSING or arg > current:
+                    set_path(doc, path, arg)
+            elif op == "$min":
+                if current is _MISSING or arg < current:
+                    set_path(doc, path, arg)
+            elif op in ("$push", "$addToSet"):
+                items = arg["$each"] if isinstance(arg, dict) and "$each" in arg else [arg]
+                if current is _MISSING:
+                    current = []
+                    set_path(doc, path, current)
+                for item in items:
+                    if op == "$push" or item not in current:
+                        current.append(copy.deepcopy(item))
+            elif op == "$pull":
+                if isinstance(current, list):
+                    if isinstance(arg, dict):
+                        kept = [v for v in current if not matches({"v": v}, {"v": arg})]
+                    else:
+                        kept = [v for v in current if v != arg]
+                    set_path(doc, path, kept)
+            else:
+                raise NotImplementedError(f"Memory backend: update operator {op} not supported")
+    return doc != before
+
+def _upsert_seed(query: dict) -> dict:
+    """Equality fields of the filter become the new document's fields on upsert."""
+    doc = {}
+    for key, condition in (query or {}).items():
+        if key.startswith("$"):
+            continue
+        if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if "$eq" in condition:
+                set_path(doc, key, copy.deepcopy(condition["$eq"]))
+            continue
+        set_path(doc, key, copy.deepcopy(condition))
+    return doc
+
+
+# --- CURSOR ---
+
+def _sort_key(value):
+    # Mongo orders missing/None before numbers before strings
+    if value is _MISSING or value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, str(value))
+
+class MemoryCursor:
+    def __init__(self, docs: list, projection=None):
+        self._docs = docs
+        self._projection = projection
+        self._sort = []
+        self._skip = 0
+        self._limit = 0
+
+    def sort(self, key, direction: int = 1):
+        self._sort = list(key) if isinstance(key, list) else [(key, direction)]
+        return self
+
+    def skip(self, count: int):
+        self._skip = count
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def _results(self) -> list:
+        docs = list(self._docs)
+        # Stable sorts from the last key to the first = multi-key sort
+        for key, direction in reversed(self._sort):
+            docs.sort(key=lambda d: _sort_key(get_path(d, key)), reverse=direction < 0)
+        docs = docs[self._skip:]
+        if self._limit:
+            docs = docs[:self._limit]
+        return [_project(d, self._projection) for d in docs]
+
+    async def to_list(self, length=None):
+        await _round_trip()
+        docs = self._results()
+        return docs if length is None else docs[:length]
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._results():
+            yield doc
+
+def _project(doc: dict, projection) -> dict:
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    include = {k for k, v in projection.items() if v}
+    if include:
+        result = {k: doc[k] for k in include if k in doc}
+        if projection.get("_id", 1) and "_id" in doc:
+            result["_id"] = doc["_id"]
+        return result
+    for key in projection:
+        doc.pop(key, None)
+    return doc
+
+
+# --- COLLECTION / DATABASE / CLIENT ---
+
+class MemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self._docs: dict = {}  # _id -> document (insertion ordered)
+
+    def _matching(self, query) -> list:
+        if query and set(query) == {"_id"} and not isinstance(query["_id"], dict):
+            doc = self._docs.get(query["_id"])
+            return [doc] if doc is not None else []
+        return [d for d in self._docs.values() if matches(d, query)]
+
+    def _insert(self, doc: dict):
+        doc.setdefault("_id", ObjectId())
+        if doc["_id"] in self._docs:
+            raise ValueError(f"Memory backend: duplicate _id {doc['_id']!r} in {self.name}")
+        self._docs[doc["_id"]] = doc
+        return doc["_id"]
+
+    # Reads
+    async def find_one(self, filter=None, projection=None, **kwargs):
+        await _round_trip()
+        found = self._matching(filter)
+        return _project(found[0], projection) if found else None
+
+    def find(self, filter=None, projection=None, **kwargs):
+        return MemoryCursor(self._matching(filter), projection)
+
+    async def count_documents(self, filter=None, **kwargs):
+        await _round_trip()
+        return len(self._matching(filter))
+
+    async def distinct(self, key: str, filter=None, **kwargs):
+        await _round_trip()
+        values = []
+        for doc in self._matching(filter):
+            value = get_path(doc, key)
+            for v in (value if isinstance(value, list) else [value]):
+                if v is not _MISSING and v not in values:
+                    values.append(v)
+        return values
+
+    # Writes
+    async def insert_one(self, document: dict, **kwargs):
+        await _round_trip()
+        return InsertOneResult(self._insert(copy.deepcopy(document)))
+
+    async def insert_many(self, documents: list, **kwargs):
+        await _round_trip()
+        return [self._insert(copy.deepcopy(d)) for d in documents]
+
+    def _update(self, filter, update, upsert: bool, many: bool) -> UpdateResult:
+        found = self._matching(filter)
+        if not many:
+            found = found[:1]
+        if not found:
+            if not upsert:
+                return UpdateResult()
+            doc = _upsert_seed(filter)
+            apply_update(doc, update, inserting=True)
+            return UpdateResult(upserted_id=self._insert(doc))
+
+        modified = sum(apply_update(doc, update) for doc in found)
+        return UpdateResult(matched_count=len(found), modified_count=modified)
+
+    async def update_one(self, filter, update, upsert: bool = False, **kwargs):
+        await _round_trip()
+        return self._update(filter, update, upsert, many=False)
+
+    async def update_many(self, filter, update, upsert: bool = False, **kwargs):
+        await _round_trip()
+        return self._update(filter, update, upsert, many=True)
+
+    async def replace_one(self, filter, replacement, upsert: bool = False, **kwargs):
+        await _round_trip()
+        return self._update(filter, replacement, upsert, many=False)
+
+    async def find_one_and_update(self, filter, update, upsert: bool = False,
+                                  return_document: bool = False, projection=None, **kwargs):
+        await _round_trip()
+        found = self._matching(filter)[:1]
+        before = copy.deepcopy(found[0]) if found else None
+        result = self._update(filter, update, upsert, many=False)
+        if return_document:  # ReturnDocument.AFTER is True
+            _id = found[0]["_id"] if found else result.upserted_id
+            doc = self._docs.get(_id)
+            return _project(doc, projection) if doc is not None else None
+        return _project(before, projection) if before is not None else None
+
+    def _delete(self, filter, many: bool) -> DeleteResult:
+        found = self._matching(filter)
+        if not many:
+            found = found[:1]
+        for doc in found:
+            del self._docs[doc["_id"]]
+        return DeleteResult(deleted_count=len(found))
+
+    async def delete_one(self, filter, **kwargs):
+        await _round_trip()
+        return self._delete(filter, many=False)
+
+    async def delete_many(self, filter, **kwargs):
+        await _round_trip()
+        return self._delete(filter, many=True)
+
+    async def bulk_write(self, requests: list, ordered: bool = True, **kwargs):
+        """Accepts pymongo's UpdateOne / UpdateMany / ReplaceOne / InsertOne / DeleteOne / DeleteMany."""
+        await _round_trip()
+        result = BulkWriteResult()
+        for index, op in enumerate(requests):
+            if isinstance(op, InsertOne):
+                self._insert(copy.deepcopy(op._doc))
+                result.inserted_count += 1
+            elif isinstance(op, (UpdateOne, UpdateMany, ReplaceOne)):
+                res = self._update(op._filter, op._doc, bool(op._upsert), many=isinstance(op, UpdateMany))
+                result.matched_count += res.matched_count
+                result.modified_count += res.modified_count
+                if res.upserted_id is not None:
+                    result.upserted_count += 1
+                    result.upserted_ids[index] = res.upserted_id
+            elif isinstance(op, (DeleteOne, DeleteMany)):
+                result.deleted_count += self._delete(op._filter, many=isinstance(op, DeleteMany)).deleted_count
+            else:
+                raise NotImplementedError(f"Memory backend: bulk op {type(op).__name__} not supported")
+        return result
+
+    async def create_index(self, *args, **kwargs):
+        return "memory_index"
+
+
+class MemoryDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = MemoryCollection(name)
+        return self._collections[name]
+
+    def __getattr__(self, name: str) -> MemoryCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    async def command(self, command, *args, **kwargs):
+        # Enough for ping_database()
+        await _round_trip()
+        return {"ok": 1.0}
+
+    async def list_collection_names(self, **kwargs):
+        return list(self._collections)
+
+
+class MemoryClient:
+    """Drop-in for AsyncIOMotorClient: client[db_name][collection]."""
+
+    def __init__(self):
+        self._databases: dict[str, MemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> MemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = MemoryDatabase(name)
+        return self._databases[name]
+
+    @property
+    def admin(self) -> MemoryDatabase:
+        return self["admin"]
+
+    def close(self):
+        pass
@@ -1,26 +1,147 @@
 from datetime import datetime
+import importlib.util
 import os
+import time
 import uuid
 import motor.motor_asyncio
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
 import certifi
 from dotenv import load_dotenv
 
+from database.instrumentation import InstrumentedDatabase, instrument_module
+
 load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
-
-if not MONGO_URI:
+# 'mongo' = real cluster via MONGO_URI, 'memory' = in-process stand-in (offline tests/benchmarks)
+DB_BACKEND = os.getenv("DB_BACKEND", "mongo").lower()
+
+# --- CONNECTION POOL SETTINGS ---
+# All optional; defaults are tuned for a single bot process on Atlas.
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "r7_bot_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", "300000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000"))
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS")  # unset = best installed of zstd/snappy/zlib
+MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE")  # unset = driver default (primary)
+MONGO_RETRY_WRITES = os.getenv("MONGO_RETRY_WRITES", "true").lower() in ("1", "true", "yes")
+
+# Compressors that need an extra package (zlib is built in)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+def available_compressors(requested: str = None) -> list[str]:
+    """Keeps only the requested compressors whose library is installed (warns if one was asked for)."""
+    explicit = requested is not None
+    names = []
+    for name in (c.strip().lower() for c in (requested or "zstd,snappy,zlib").split(",") if c.strip()):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            names.append(name)
+        elif explicit:
+            print(f"⚠️ Mongo compressor '{name}' unavailable, skipping.")
+    return names
+
+def create_client(uri: str) -> motor.motor_asyncio.AsyncIOMotorClient:
+    """Builds the Motor client with the pool/timeout/compression settings above."""
+    options = dict(
+        tlsCAFile=certifi.where(),  # Mac/SSL fix
+        appname="R7Bot",
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGO_MAX_IDLE_MS,
+        serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+        socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        retryWrites=MONGO_RETRY_WRITES,
+    )
+    if MONGO_READ_PREFERENCE:
+        # Opt-in only: secondary reads can return stale balances/settings
+        options["readPreference"] = MONGO_READ_PREFERENCE
+    compressors = available_compressors(MONGO_COMPRESSORS)
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    return motor.motor_asyncio.AsyncIOMotorClient(uri, **options)
+
+client = None
+
+if DB_BACKEND == "memory":
+    from database.memory import MemoryClient
+    print("🧪 Using in-memory database backend (DB_BACKEND=memory) — data is not persisted.")
+    client = MemoryClient()
+    db = InstrumentedDatabase(client[MONGO_DB_NAME])
+elif not MONGO_URI:
     print("⚠️ CRITICAL: MONGO_URI missing in .env or Pella variables.")
     db = None
 else:
     try:
-        # Connect to MongoDB with the Mac/SSL fix
-        client = motor.motor_asyncio.AsyncIOMotorClient(MONGO_URI, tlsCAFile=certifi.where())
-        db = client["r7_bot_db"]
-        print("✅ Connected to Cloud Database (MongoDB)")
+        # Motor connects lazily; ping_database() does the real round-trip at boot
+        client = create_client(MONGO_URI)
+        # Proxy records each query's filter shape for the slow-query log
+        db = InstrumentedDatabase(client[MONGO_DB_NAME])
     except Exception as e:
         print(f"❌ DB Connection Error: {e}")
         db = None
 
+async def ping_database() -> bool:
+    """Round-trips a ping to the server. Returns True if the DB answered."""
+    if db is None: return False
+    start = time.perf_counter()
+    try:
+        await client.admin.command("ping")
+        label = "In-Memory Database" if DB_BACKEND == "memory" else "Cloud Database (MongoDB)"
+        print(f"✅ Connected to {label} — ping {(time.perf_counter() - start) * 1000:.0f}ms")
+        return True
+    except Exception as e:
+        print(f"❌ MongoDB ping failed: {e}")
+        return False
+
+async def ensure_indexes():
+    """Creates the indexes the helpers rely on (idempotent, run once at boot)."""
+    if db is None: return
+    # Multikey indexes behind the payout reverse lookups (get_unpaid_recipients,
+    # clear_pending_payout), which would otherwise scan the whole collection
+    for collection, field in (("payout_logs", "unpaid_user_ids"), ("payouts", "unpaid_batches")):
+        try:
+            await db[collection].create_index(field)
+        except Exception as e:
+            print(f"⚠️ DB Error (Index {collection}.{field}): {e}")
+
+    from features.config import TRANSLATION_CACHE_TTL
+    # TTL index: Mongo drops cached translations once they're older than the cache TTL
+    try:
+        await db.translation_cache.create_index("timestamp", expireAfterSeconds=TRANSLATION_CACHE_TTL)
+    except OperationFailure as e:
+        if e.code not in (85, 86):  # IndexOptionsConflict / IndexKeySpecsConflict
+            print(f"⚠️ DB Error (Translation Cache Index): {e}")
+            return
+        # TRANSLATION_CACHE_TTL changed since the index was built: update it in place
+        try:
+            await db.command(
+                "collMod", "translation_cache",
+                index={"keyPattern": {"timestamp": 1}, "expireAfterSeconds": TRANSLATION_CACHE_TTL},
+            )
+        except Exception as e:
+            print(f"⚠️ DB Error (Translation Cache Index): {e}")
+    except Exception as e:
+        print(f"⚠️ DB Error (Translation Cache Index): {e}")
+
+# --- COLLECTION VERSIONING ---
+# Bumped in-process whenever a user's brawler/ability data changes,
+# so render caches (e.g. /brawlers pages) know when to rebuild.
+_collection_versions: dict[str, int] = {}
+
+def get_collection_version(user_id: str) -> int:
+    """Returns the current collection version for a user (0 = never changed)."""
+    return _collection_versions.get(str(user_id), 0)
+
+def bump_collection_version(user_id: str):
+    """Marks a user's brawler/ability data as changed."""
+    uid = str(user_id)
+    _collection_versions[uid] = _collection_versions.get(uid, 0) + 1
+
 # --- CORE USER HELPERS ---
 
 async def get_user_data(user_id: str):
@@ -46,6 +167,7 @@ async def get_user_data(user_id: str):
             } 
         }
         await db.users.insert_one(new_user)
+        bump_collection_version(user_id)
         return new_user
 
     # --- SELF-HEALING LOGIC ---
@@ -58,6 +180,7 @@ async def get_user_data(user_id: str):
             {"_id": str(user_id)},
             {"$set": {"brawlers.shelly": {"level": 1, "gadgets": [], "star_powers": []}}}
         )
+        bump_collection_version(user_id)
         
     return data
 
@@ -210,13 +333,15 @@ async def remove_hacked_user(user_id: str):
 
 async def add_payout_batch(amount: float, user_ids: list[str], reason: str):
     """
-    1. Logs the batch globally with a unique ID.
+    1. Logs the batch globally with a unique ID (plus who still owes it).
     2. Adds funds AND the Batch ID to every user's profile.
     """
     if db is None: return
 
     # Generate a unique receipt ID (e.g., "a1b2c3d4")
     batch_id = str(uuid.uuid4())[:8]
+    # unpaid_user_ids is a membership list: each recipient once, in first-seen order
+    recipients = list(dict.fromkeys(user_ids))
 
     # 1. Save Global Log
     log_entry = {
@@ -224,19 +349,27 @@ async def add_payout_batch(amount: float, user_ids: list[str], reason: str):
         "timestamp": datetime.utcnow(),
         "amount": amount,
         "user_ids": user_ids,
+        # Reverse index: recipients who haven't been cashed out for this batch yet
+        "unpaid_user_ids": recipients,
         "reason": reason
     }
     await db.payout_logs.insert_one(log_entry)
 
-    # 2. Update Users (Loop ensures everyone gets updated/created)
-    for uid in user_ids:
-        await db.payouts.update_one(
-            {"_id": uid},
-            {
-                "$inc": {"amount": amount},
-                "$push": {"unpaid_batches": batch_id}
-            },
-            upsert=True
+    # 2. Update Users (one bulk write; upsert ensures everyone gets updated/created)
+    if user_ids:
+        await db.payouts.bulk_write(
+            [
+                UpdateOne(
+                    {"_id": uid},
+                    {
+                        "$inc": {"amount": amount},
+                        "$push": {"unpaid_batches": batch_id}
+                    },
+                    upsert=True
+                )
+                for uid in user_ids
+            ],
+            ordered=False
         )
 
 async def get_payout_logs(limit: int = 25):
@@ -253,6 +386,20 @@ async def get_user_unpaid_batches(user_id: str):
         return doc.get("unpaid_batches", [])
     return []
 
+async def get_unpaid_recipients(batch_ids: list[str]) -> dict[str, set[str]]:
+    """
+    batch_id -> users still owed that batch, for many batches in one $in query.
+    Used for logs written before payout_logs carried unpaid_user_ids.
+    """
+    if db is None or not batch_ids: return {}
+    wanted = set(batch_ids)
+    result: dict[str, set[str]] = {batch_id: set() for batch_id in batch_ids}
+    cursor = db.payouts.find({"unpaid_batches": {"$in": list(wanted)}}, {"unpaid_batches": 1})
+    async for doc in cursor:
+        for batch_id in wanted.intersection(doc.get("unpaid_batches", [])):
+            result[batch_id].add(doc["_id"])
+    return result
+
 async def get_all_pending_payouts():
     """Returns a list of all users with a positive pending balance."""
     if db is None: return []
@@ -270,8 +417,16 @@ async def clear_pending_payout(user_id: str = None):
     
     if user_id:
         await db.payouts.update_one({"_id": user_id}, update_data)
+        await db.payout_logs.update_many(
+            {"unpaid_user_ids": user_id},
+            {"$pull": {"unpaid_user_ids": user_id}}
+        )
     else:
         await db.payouts.update_many({}, update_data)
+        await db.payout_logs.update_many(
+            {"unpaid_user_ids": {"$exists": True}},
+            {"$set": {"unpaid_user_ids": []}}
+        )
         
 
 # --- BLACKLIST HELPERS ---
@@ -293,6 +448,7 @@ async def add_blacklisted_user(user_id: str, reason: str, admin_id: str, matcher
     
     # Use replace_one with upsert to completely overwrite if they exist (updating details)
     await db.blacklist.replace_one({"_id": user_id}, doc, upsert=True)
+    return doc
 
 async def remove_blacklisted_user(user_id: str):
     """Removes a user from the blacklist."""
@@ -348,6 +504,7 @@ async def add_brawler_to_user(user_id: str, brawler_id: str):
             {"$set": {f"brawlers.{brawler_id}": new_brawler_entry}},
             upsert=True
         )
+        bump_collection_version(user_id)
         return "new"
 
 async def get_user_brawlers(user_id: str):
@@ -499,6 +656,7 @@ async def upgrade_brawler_level(user_id: str, brawler_id: str):
             }
         }
     )
+    bump_collection_version(user_id)
     
     return True, "Upgrade Successful!", next_level
 
@@ -509,6 +667,7 @@ async def add_gadget_to_user(user_id: str, brawler_id: str, gadget_name: str):
         {"_id": str(user_id)},
         {"$addToSet": {f"brawlers.{brawler_id}.gadgets": gadget_name}} # Prevents duplicates
     )
+    bump_collection_version(user_id)
 
 async def add_star_power_to_user(user_id: str, brawler_id: str, sp_name: str):
     """Adds a star power to a brawler's star_powers array."""
@@ -517,6 +676,7 @@ async def add_star_power_to_user(user_id: str, brawler_id: str, sp_name: str):
         {"_id": str(user_id)},
         {"$addToSet": {f"brawlers.{brawler_id}.star_powers": sp_name}}
     )
+    bump_collection_version(user_id)
 
 async def add_hypercharge_to_user(user_id: str, brawler_id: str, hc_name: str):
     """Adds a hypercharge to a brawler's data."""
@@ -525,6 +685,7 @@ async def add_hypercharge_to_user(user_id: str, brawler_id: str, hc_name: str):
         {"_id": str(user_id)},
         {"$set": {f"brawlers.{brawler_id}.hypercharge": hc_name}}
     )
+    bump_collection_version(user_id)
 
 # --- QUEST SYSTEM HELPERS ---
 
@@ -671,7 +832,8 @@ async def create_tourney_session():
             "total_tickets": 0,
             "total_messages": 0,
             "peak_queue": 0,
-            "current_queue": 0
+            "current_queue": 0,
+            "queue_series": {}  # "YYYY-MM-DDTHH:MM" (UTC) -> {"max", "last"}
         }
         result = await db.tourney_sessions.insert_one(new_session)
         return result.inserted_id
@@ -699,39 +861,43 @@ async def end_tourney_session(session_id):
     except Exception as e:
         print(f"⚠️ DB Error (End Session): {e}")
 
-async def increment_tourney_message_count(session_id):
-    """Increments the global message counter. SILENT FAIL enabled."""
+async def increment_tourney_message_count(session_id, amount: int = 1):
+    """Increments the global message counter by amount. SILENT FAIL enabled."""
     if db is None: return
     try:
         await db.tourney_sessions.update_one(
             {"_id": session_id},
-            {"$inc": {"total_messages": 1}}
+            {"$inc": {"total_messages": amount}}
         )
     except Exception as e:
         # We assume this is high-volume, so we just log and move on
         print(f"⚠️ DB Error (Msg Count): {e}")
 
 async def update_tourney_queue(session_id, change: int):
-    """Updates current queue size. SILENT FAIL enabled."""
+    """
+    Updates current queue size, peak queue and this minute's queue_series bucket
+    in one atomic pipeline update. SILENT FAIL enabled.
+    """
     if db is None: return
+    bucket = f"queue_series.{datetime.utcnow().strftime('%Y-%m-%dT%H:%M')}"
     try:
-        # Update current queue and return the new document
-        updated_doc = await db.tourney_sessions.find_one_and_update(
+        await db.tourney_sessions.update_one(
             {"_id": session_id},
-            {"$inc": {"current_queue": change, "total_tickets": 1 if change > 0 else 0}},
-            return_document=True
+            [
+                {"$set": {
+                    "current_queue": {"$add": [{"$ifNull": ["$current_queue", 0]}, change]},
+                    "total_tickets": {"$add": [{"$ifNull": ["$total_tickets", 0]}, 1 if change > 0 else 0]},
+                }},
+                # Second stage sees the new current_queue
+                {"$set": {
+                    "peak_queue": {"$max": ["$peak_queue", "$current_queue"]},
+                    bucket: {
+                        "max": {"$max": [f"${bucket}.max", "$current_queue"]},
+                        "last": "$current_queue",
+                    },
+                }},
+            ]
         )
-        
-        # Check peak queue
-        if updated_doc:
-            current = updated_doc.get("current_queue", 0)
-            peak = updated_doc.get("peak_queue", 0)
-            
-            if current > peak:
-                await db.tourney_sessions.update_one(
-                    {"_id": session_id},
-                    {"$set": {"peak_queue": current}}
-                )
     except Exception as e:
         print(f"⚠️ DB Error (Update Queue): {e}")
 
@@ -762,4 +928,32 @@ async def get_top_staff_stats(session_id, limit: int = 12):
         return await cursor.to_list(length=limit)
     except Exception as e:
         print(f"⚠️ DB Error (Get Stats): {e}")
-        return []
\ No newline at end of file
+        return []
+
+# --- TRANSLATION CACHE HELPERS ---
+
+async def get_cached_translation(cache_key: str):
+    """Returns the stored translation document for this cache key, or None."""
+    if db is None: return None
+    try:
+        return await db.translation_cache.find_one({"_id": cache_key})
+    except Exception as e:
+        print(f"⚠️ DB Error (Get Translation): {e}")
+        return None
+
+async def save_cached_translation(cache_key: str, value: str):
+    """Stores a translation result. SILENT FAIL enabled."""
+    if db is None: return
+    try:
+        await db.translation_cache.update_one(
+            {"_id": cache_key},
+            {"$set": {"value": value, "timestamp": datetime.utcnow()}},
+            upsert=True
+        )
+    except Exception as e:
+        print(f"⚠️ DB Error (Save Translation): {e}")
+
+
+# --- INSTRUMENTATION ---
+# Wrap every async helper above with latency/error tracking (see /perf db).
+instrument_module(globals(), __name__)
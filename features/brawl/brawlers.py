@@ -1,3 +1,4 @@
+import functools
 import json
 import os 
 from dataclasses import dataclass
@@ -32,4 +33,56 @@ def load_brawlers():
         print(f"Error loading brawlers: {e}")
         return []
     
-BRAWLER_ROSTER = load_brawlers()
\ No newline at end of file
+# --- LAZY ROSTER ---
+# brawlers.json is parsed (and the tables below built) on first access, not at import,
+# so loading the brawl cog at boot costs nothing. BRAWLER_ROSTER, ROSTER_BY_ID,
+# ROSTER_BY_RARITY, TOTAL_BRAWLERS, TOTAL_HYPERCHARGES, MAX_GADGETS, MAX_STAR_POWERS and
+# ROSTER_NAME_INDEX resolve through the module __getattr__ - read them as
+# `brawlers.NAME` at call time, not with `from .brawlers import NAME` at import.
+
+# --- NAME SEARCH INDEX (autocomplete) ---
+# Every lowercase substring of every brawler name -> matching brawlers (roster order),
+# so a keystroke lookup is a single dict hit instead of a roster scan.
+def _build_name_index(roster):
+    index: dict[str, list[Brawler]] = {}
+    for b in roster:
+        name = b.name.lower()
+        substrings = {name[i:j] for i in range(len(name)) for j in range(i + 1, len(name) + 1)}
+        for sub in substrings:
+            index.setdefault(sub, []).append(b)
+    return {sub: tuple(matches) for sub, matches in index.items()}
+
+@functools.cache
+def _roster_tables() -> dict:
+    """Parses the roster and computes every roster-wide table (once per process)."""
+    roster = load_brawlers()
+    by_rarity: dict[str, list[Brawler]] = {}
+    for b in roster:
+        by_rarity.setdefault(b.rarity, []).append(b)
+    total = len(roster)
+    return {
+        "BRAWLER_ROSTER": roster,
+        "ROSTER_BY_ID": {b.id.lower(): b for b in roster},
+        "ROSTER_BY_RARITY": by_rarity,
+        "TOTAL_BRAWLERS": total,
+        "TOTAL_HYPERCHARGES": sum(1 for b in roster if b.hypercharge),
+        # Every brawler has 2 gadgets and 2 star powers
+        "MAX_GADGETS": total * 2,
+        "MAX_STAR_POWERS": total * 2,
+        "ROSTER_NAME_INDEX": _build_name_index(roster),
+    }
+
+def __getattr__(name):
+    tables = _roster_tables()
+    if name not in tables:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache as real module globals so later lookups skip __getattr__
+    globals().update(tables)
+    return tables[name]
+
+def search_roster(query: str):
+    """Returns brawlers whose name contains `query` (case-insensitive), in roster order."""
+    tables = _roster_tables()
+    if not query:
+        return tables["BRAWLER_ROSTER"]
+    return tables["ROSTER_NAME_INDEX"].get(query.lower(), ())
@@ -1,102 +1,167 @@
+from collections import OrderedDict
+import functools
+import time
 import discord
 from discord import app_commands
 from discord.ext import commands
 from features.config import EMOJI_GADGET_DEFAULT, EMOJI_STARPOWER_DEFAULT, EMOJI_HYPERCHARGE_DEFAULT, EMOJIS_BRAWLERS, EMOJIS_RARITIES, EMOJIS_DROPS
-from .brawlers import BRAWLER_ROSTER
+from . import brawlers as roster
 from .drops import open_mega_box, open_starr_drop
-from database.mongo import get_user_brawlers
+from database.mongo import get_user_brawlers, get_collection_version
 
 SUPERCELL_DISCLAIMER = "This material is unofficial and is not endorsed by Supercell. For more information see Supercell's Fan Content Policy: www.supercell.com/fan-content-policy."
 
+# --- COLLECTION PAGE CACHE ---
+# user_id -> (collection_version, user_name, {page: embed})
+# Rebuilt only when the user's brawler/ability data changes (see get_collection_version).
+COLLECTION_CACHE_MAX_USERS = 500
+_collection_page_cache: "OrderedDict[str, tuple[int, str, dict[int, discord.Embed]]]" = OrderedDict()
+
+COLLECTION_PAGES = {
+    1: (["Starting", "Rare", "Super Rare", "Epic"], "(Common - Epic)"),
+    2: (["Mythic", "Legendary", "Ultra Legendary", "Chromatic"], "(Mythic - Ultra)"),
+}
+
+def build_collection_embed(user_name: str, brawlers_data: dict, page: int) -> discord.Embed:
+    """Builds one /brawlers page from the user's brawler dict."""
+    # Normalize keys to lowercase to ensure matching works
+    # brawlers_data looks like: {"shelly": {"level": 5}, "colt": {"level": 1}}
+    brawlers_data = {k.lower(): v for k, v in brawlers_data.items()}
+    rarity_order, title_suffix = COLLECTION_PAGES.get(page, COLLECTION_PAGES[2])
+
+    embed = discord.Embed(
+        title=f"👤 {user_name}'s Collection {title_suffix}",
+        color=discord.Color.blue()
+    )
+
+    for rarity_name in rarity_order:
+        if rarity_name not in roster.ROSTER_BY_RARITY: continue
+        
+        rarity_key = rarity_name.lower().replace(" ", "_")
+        r_emoji = EMOJIS_RARITIES.get(rarity_key, "⚪")
+        
+        field_value = ""
+        part = 1
+        
+        for b in roster.ROSTER_BY_RARITY[rarity_name]:
+            b_id_lower = b.id.lower().strip()
+            b_emoji = EMOJIS_BRAWLERS.get(b_id_lower, "❓")
+            
+            # Check ownership
+            b_data = brawlers_data.get(b_id_lower)
+            
+            if b_data is not None:
+                lvl = b_data.get("level", 1)
+                owned_gadgets = b_data.get("gadgets", [])
+                owned_sps = b_data.get("star_powers", [])
+                has_hc = b_data.get("hypercharge") # Check if they own the HC
+
+                status = f"`Lvl {lvl}`"
+                if owned_gadgets:
+                    status += f" | {EMOJI_GADGET_DEFAULT} {len(owned_gadgets)}/2"
+                if owned_sps:
+                    status += f" | {EMOJI_STARPOWER_DEFAULT} {len(owned_sps)}/2"
+                if has_hc:
+                    status += f" | {EMOJI_HYPERCHARGE_DEFAULT} 1/1"
+                
+                line = f"{b_emoji} **{b.name}** {status} ✅\n"
+
+                # Safety Check for Field Length
+                if len(field_value) + len(line) > 1000:
+                    f_name = f"{r_emoji} {rarity_name}" + (f" (Part {part})" if part > 1 else "")
+                    embed.add_field(name=f_name, value=field_value, inline=True)
+                    field_value = line
+                    part += 1
+                else:
+                    field_value += line
+
+        if field_value:
+            f_name = f"{r_emoji} {rarity_name}" + (f" (Part {part})" if part > 1 else "")
+            embed.add_field(name=f_name, value=field_value, inline=True)
+
+    footer_text = f"Page {page}/2 • Total: {len(brawlers_data)}\n{SUPERCELL_DISCLAIMER}"
+    embed.set_footer(text=footer_text)
+    return embed
+
+async def get_collection_pages(user_id: str, user_name: str) -> dict[int, discord.Embed]:
+    """
+    Returns the cached /brawlers pages for this user, rebuilding them
+    (one DB read) only if their collection version or display name changed.
+    Callers must .copy() an embed before mutating it.
+    """
+    version = get_collection_version(user_id)
+    entry = _collection_page_cache.get(user_id)
+    if entry and entry[0] == version and entry[1] == user_name:
+        _collection_page_cache.move_to_end(user_id)
+        return entry[2]
+
+    from database.mongo import get_user_data
+    user_doc = await get_user_data(user_id)
+    brawlers_data = user_doc.get("brawlers", {})
+
+    pages = {page: build_collection_embed(user_name, brawlers_data, page) for page in COLLECTION_PAGES}
+
+    # Tag with the version read before the await: a write that lands during the
+    # DB read (or a self-heal bump) then just forces one rebuild instead of
+    # pinning stale pages under the newer version
+    _collection_page_cache[user_id] = (version, user_name, pages)
+    _collection_page_cache.move_to_end(user_id)
+    while len(_collection_page_cache) > COLLECTION_CACHE_MAX_USERS:
+        _collection_page_cache.popitem(last=False)
+    return pages
+
+# --- OWNED BRAWLER CACHE (autocomplete) ---
+# user_id -> (expires_at, collection_version, lowercase owned ids)
+# Short TTL as a safety net; a collection version bump invalidates immediately.
+OWNED_CACHE_TTL = 30
+OWNED_CACHE_MAX_USERS = 2000
+_owned_brawlers_cache: dict[str, tuple[float, int, frozenset[str]]] = {}
+
+# Choices are immutable, so build them once per brawler
+@functools.cache
+def _roster_choices() -> dict[str, app_commands.Choice[str]]:
+    return {b.id.lower(): app_commands.Choice(name=b.name, value=b.id) for b in roster.BRAWLER_ROSTER}
+
+async def get_owned_brawler_ids(user_id: str) -> frozenset[str]:
+    """Returns the user's owned brawler IDs (lowercase), cached for a few seconds."""
+    now = time.monotonic()
+    version = get_collection_version(user_id)
+    entry = _owned_brawlers_cache.get(user_id)
+    if entry and entry[0] > now and entry[1] == version:
+        return entry[2]
+
+    owned_raw = await get_user_brawlers(user_id)
+    # Handle both Dictionary (new system) and List (old system)
+    if isinstance(owned_raw, dict):
+        owned_raw = owned_raw.keys()
+    owned = frozenset(str(b_id).lower() for b_id in owned_raw or ())
+
+    if len(_owned_brawlers_cache) >= OWNED_CACHE_MAX_USERS:
+        for uid in [uid for uid, e in _owned_brawlers_cache.items() if e[0] <= now]:
+            del _owned_brawlers_cache[uid]
+        if len(_owned_brawlers_cache) >= OWNED_CACHE_MAX_USERS:
+            _owned_brawlers_cache.clear()
+    _owned_brawlers_cache[user_id] = (now + OWNED_CACHE_TTL, version, owned)
+    return owned
+
 class BrawlerPagination(discord.ui.View):
     """View class to handle switching between Page 1 and Page 2 using buttons."""
-    def __init__(self, user_name: str, brawlers_data: dict):
+    def __init__(self, user_id: str, user_name: str):
         super().__init__(timeout=60)
+        self.user_id = user_id
         self.user_name = user_name
-        
-        # Normalize keys to lowercase to ensure matching works
-        # brawlers_data looks like: {"shelly": {"level": 5}, "colt": {"level": 1}}
-        self.brawlers_data = {k.lower(): v for k, v in brawlers_data.items()}
-        self.owned_ids = list(self.brawlers_data.keys())
-
-    def create_embed(self, page: int):
-        # 1. Define Page Groups
-        if page == 1:
-            rarity_order = ["Starting", "Rare", "Super Rare", "Epic"]
-            title_suffix = "(Common - Epic)"
-        else:
-            rarity_order = ["Mythic", "Legendary", "Ultra Legendary", "Chromatic"]
-            title_suffix = "(Mythic - Ultra)"
 
-        categories = {}
-        for b in BRAWLER_ROSTER:
-            if b.rarity not in categories:
-                categories[b.rarity] = []
-            categories[b.rarity].append(b)
-
-        embed = discord.Embed(
-            title=f"👤 {self.user_name}'s Collection {title_suffix}",
-            color=discord.Color.blue()
-        )
-
-        for rarity_name in rarity_order:
-            if rarity_name not in categories: continue
-            
-            rarity_key = rarity_name.lower().replace(" ", "_")
-            r_emoji = EMOJIS_RARITIES.get(rarity_key, "⚪")
-            
-            field_value = ""
-            part = 1
-            
-            for b in categories[rarity_name]:
-                b_id_lower = b.id.lower().strip()
-                b_emoji = EMOJIS_BRAWLERS.get(b_id_lower, "❓")
-                
-                # Check ownership
-                is_owned = b_id_lower in self.owned_ids
-                
-                # Inside commands.py -> BrawlerPagination -> create_embed
-                if is_owned:
-                    b_data = self.brawlers_data[b_id_lower]
-                    lvl = b_data.get("level", 1)
-                    owned_gadgets = b_data.get("gadgets", [])
-                    owned_sps = b_data.get("star_powers", [])
-                    has_hc = b_data.get("hypercharge") # Check if they own the HC
-
-                    status = f"`Lvl {lvl}`"
-                    if owned_gadgets:
-                        status += f" | {EMOJI_GADGET_DEFAULT} {len(owned_gadgets)}/2"
-                    if owned_sps:
-                        status += f" | {EMOJI_STARPOWER_DEFAULT} {len(owned_sps)}/2"
-                    if has_hc:
-                        status += f" | {EMOJI_HYPERCHARGE_DEFAULT} 1/1"
-                    
-                    line = f"{b_emoji} **{b.name}** {status} ✅\n"
-
-                    # Safety Check for Field Length
-                    if len(field_value) + len(line) > 1000:
-                        f_name = f"{r_emoji} {rarity_name}" + (f" (Part {part})" if part > 1 else "")
-                        embed.add_field(name=f_name, value=field_value, inline=True)
-                        field_value = line
-                        part += 1
-                    else:
-                        field_value += line
-
-            if field_value:
-                f_name = f"{r_emoji} {rarity_name}" + (f" (Part {part})" if part > 1 else "")
-                embed.add_field(name=f_name, value=field_value, inline=True)
-
-        footer_text = f"Page {page}/2 • Total: {len(self.owned_ids)}\n{SUPERCELL_DISCLAIMER}"
-        embed.set_footer(text=footer_text)
-        return embed
+    async def create_embed(self, page: int):
+        pages = await get_collection_pages(self.user_id, self.user_name)
+        return pages[page].copy()
 
     @discord.ui.button(label="Page 1", style=discord.ButtonStyle.primary)
     async def page_one(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.edit_message(embed=self.create_embed(1), view=self)
+        await interaction.response.edit_message(embed=await self.create_embed(1), view=self)
 
     @discord.ui.button(label="Page 2", style=discord.ButtonStyle.primary)
     async def page_two(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.edit_message(embed=self.create_embed(2), view=self)
+        await interaction.response.edit_message(embed=await self.create_embed(2), view=self)
         
 class BrawlerShopSelect(discord.ui.Select):
     def __init__(self, user_id, rarity, brawlers_page, price):
@@ -128,7 +193,7 @@ class BrawlerShopSelect(discord.ui.Select):
         await add_brawler_to_user(self.user_id, brawler_id)
         
         # Find brawler name for the success message
-        b_name = next(b.name for b in BRAWLER_ROSTER if b.id == brawler_id)
+        b_name = next(b.name for b in roster.BRAWLER_ROSTER if b.id == brawler_id)
         await interaction.response.send_message(f"🎉 Success! You've unlocked **{b_name}** for **{self.price}** Credits!")
 
 class PaginatedShopView(discord.ui.View):
@@ -184,7 +249,7 @@ class BuyBrawlerView(discord.ui.View):
         price = BRAWLER_PRICES.get(rarity, 0)
         
         # Filter: Only brawlers of this rarity NOT in user's owned list
-        available = [b for b in BRAWLER_ROSTER if b.rarity == rarity and b.id.lower() not in self.owned_ids]
+        available = [b for b in roster.BRAWLER_ROSTER if b.rarity == rarity and b.id.lower() not in self.owned_ids]
         
         if not available:
             return await interaction.response.send_message(f"✨ Impressive! You already own all {rarity} brawlers.", ephemeral=True)
@@ -426,7 +491,7 @@ class AbilityShopView(discord.ui.View):
         brawler_data = user_data.get("brawlers", {}).get(self.brawler_id, {})
         
         # 2. Get Master Data
-        b_info = next((b for b in BRAWLER_ROSTER if b.id == self.brawler_id), None)
+        b_info = next((b for b in roster.BRAWLER_ROSTER if b.id == self.brawler_id), None)
         
         current_lvl = brawler_data.get("level", 1)
         owned_gadgets = brawler_data.get("gadgets", [])
@@ -601,16 +666,9 @@ class BrawlCommands(commands.Cog):
         
         user_id = str(interaction.user.id)
         
-        # Import get_user_data to fetch the full dictionary (including levels)
-        from database.mongo import get_user_data
-        
-        user_doc = await get_user_data(user_id)
-        # Get the brawlers dict, e.g., {'shelly': {'level': 1}, 'colt': {'level': 5}}
-        brawlers_data = user_doc.get("brawlers", {})
-        
-        # Pass the dictionary to the view
-        view = BrawlerPagination(interaction.user.name, brawlers_data)
-        embed = view.create_embed(1) 
+        # Pages come from the per-user render cache (DB is only hit when the collection changed)
+        view = BrawlerPagination(user_id, interaction.user.name)
+        embed = await view.create_embed(1) 
         
         embed.set_footer(text=SUPERCELL_DISCLAIMER)
         await interaction.followup.send(embed=embed, view=view)
@@ -629,24 +687,18 @@ class BrawlCommands(commands.Cog):
         currencies = user_doc.get("currencies", {})
         brawlers_data = user_doc.get("brawlers", {})
         
-        # 2. Calculate Progress
-        total_brawlers = len(BRAWLER_ROSTER)
+        # 2. Calculate Progress (roster-wide totals are precomputed in brawlers.py)
         owned_count = len(brawlers_data)
         
         total_gadgets_owned = 0
         total_sps_owned = 0
         total_hcs_owned = 0
         
-        total_hcs_possible = sum(1 for b in BRAWLER_ROSTER if getattr(b, 'hypercharge', None))
-        
         for data in brawlers_data.values():
             total_gadgets_owned += len(data.get("gadgets", []))
             total_sps_owned += len(data.get("star_powers", []))
             
             if data.get("hypercharge"): total_hcs_owned += 1
-            
-        # Max possible is total_brawlers * 2
-        max_items = total_brawlers * 2
 
         # 3. Get Emojis
         from features.config import EMOJIS_CURRENCY, EMOJI_GADGET_DEFAULT, EMOJI_STARPOWER_DEFAULT
@@ -661,10 +713,10 @@ class BrawlCommands(commands.Cog):
         
         # Collection Stats Field
         collection_text = (
-            f"🗃️ **Brawlers:** {owned_count} / {total_brawlers}\n"
-            f"{EMOJI_GADGET_DEFAULT} **Gadgets:** {total_gadgets_owned} / {max_items}\n"
-            f"{EMOJI_STARPOWER_DEFAULT} **Star Powers:** {total_sps_owned} / {max_items}\n"
-            f"{EMOJI_HYPERCHARGE_DEFAULT} **Hypercharges:** {total_hcs_owned} / {total_hcs_possible}"
+            f"🗃️ **Brawlers:** {owned_count} / {roster.TOTAL_BRAWLERS}\n"
+            f"{EMOJI_GADGET_DEFAULT} **Gadgets:** {total_gadgets_owned} / {roster.MAX_GADGETS}\n"
+            f"{EMOJI_STARPOWER_DEFAULT} **Star Powers:** {total_sps_owned} / {roster.MAX_STAR_POWERS}\n"
+            f"{EMOJI_HYPERCHARGE_DEFAULT} **Hypercharges:** {total_hcs_owned} / {roster.TOTAL_HYPERCHARGES}"
         )
         embed.add_field(name="📊 Collection Progress", value=collection_text, inline=False)
         
@@ -703,31 +755,18 @@ class BrawlCommands(commands.Cog):
     async def brawler_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
         try:
             user_id = str(interaction.user.id)
-            # Fetch user's data
-            owned_raw = await get_user_brawlers(user_id)
-            
-            # CRITICAL FIX: Handle both Dictionary (new system) and List (old system)
-            if isinstance(owned_raw, dict):
-                owned_ids = list(owned_raw.keys())
-            elif isinstance(owned_raw, list):
-                owned_ids = owned_raw
-            else:
-                return [] 
+            # In-memory after the first keystroke (see get_owned_brawler_ids)
+            owned_ids = await get_owned_brawler_ids(user_id)
                 
             choices = []
-            for b_id in owned_ids:
-                # Normalize DB ID to lowercase string for safe matching
-                clean_id = str(b_id).lower()
-                
-                # Robust Search: Find brawler in roster matching the ID (case-insensitive)
-                b_obj = next((b for b in BRAWLER_ROSTER if b.id.lower() == clean_id), None)
-                
-                if b_obj:
-                    # Filter: Check if user's typed text matches the Brawler's Name
-                    if current.lower() in b_obj.name.lower():
-                        choices.append(app_commands.Choice(name=b_obj.name, value=b_obj.id))
+            # Name index lookup, then keep only brawlers the user owns
+            for b_obj in roster.search_roster(current):
+                if b_obj.id.lower() in owned_ids:
+                    choices.append(_roster_choices()[b_obj.id.lower()])
+                    if len(choices) == 25: # Discord limit
+                        break
             
-            return choices[:25] # Discord limit
+            return choices
             
         except Exception as e:
             # This prevents the "Loading options failed" popup
@@ -741,7 +780,7 @@ class BrawlCommands(commands.Cog):
         brawler_id = brawler.lower()
         
         # Get basic info for the view setup
-        b_obj = next((b for b in BRAWLER_ROSTER if b.id.lower() == brawler_id), None)
+        b_obj = next((b for b in roster.BRAWLER_ROSTER if b.id.lower() == brawler_id), None)
         
         if not b_obj:
             return await interaction.response.send_message("❌ Brawler not found.", ephemeral=True)
@@ -784,7 +823,7 @@ class BrawlCommands(commands.Cog):
         if brawler_id not in [x.lower() for x in owned_ids]:
             return await interaction.response.send_message("❌ You don't own this brawler!", ephemeral=True)
 
-        b_obj = next((b for b in BRAWLER_ROSTER if b.id == brawler_id), None)
+        b_obj = next((b for b in roster.BRAWLER_ROSTER if b.id == brawler_id), None)
         
         # 2. Get Emoji
         b_emoji = EMOJIS_BRAWLERS.get(brawler_id, "✨")
@@ -1,4 +1,3 @@
-import random
 # Import your new config dictionaries
 from features.config import (
     MEGA_BOX_LOOT, STARR_DROP_RARITIES, STARR_DROP_LOOT, 
@@ -16,15 +15,24 @@ from database.mongo import (
     add_star_power_to_user,
     add_hypercharge_to_user
 )
-from .brawlers import load_brawlers
-
-# 1. Load the full roster into memory once when the bot starts
-BRAWLER_ROSTER = load_brawlers()
+from features.sampling import WeightedSampler, rng
+# 1. Shared roster (parsed once, on first use, in brawlers.py)
+from . import brawlers as roster
+
+# 2. Compile the loot tables into samplers once (O(1) draws, no per-call list building)
+MEGA_BOX_SAMPLER = WeightedSampler.from_loot_table(MEGA_BOX_LOOT)
+STARR_DROP_RARITY_SAMPLER = WeightedSampler.from_mapping(STARR_DROP_RARITIES)
+STARR_DROP_SAMPLERS = {
+    rarity: WeightedSampler.from_loot_table(table)
+    for rarity, table in STARR_DROP_LOOT.items() if table
+}
 
 def pick_weighted_item(loot_table):
-    """Selects an item based on 'weight' key using standard RNG."""
-    weights = [item['weight'] for item in loot_table]
-    return random.choices(loot_table, weights=weights, k=1)[0]
+    """Selects an item based on 'weight' key. Prefer a precompiled sampler in hot paths."""
+    if isinstance(loot_table, WeightedSampler):
+        return loot_table.draw()
+    # One-off tables: a single O(n) roll beats building an alias table per call
+    return rng.choices(loot_table, weights=[item["weight"] for item in loot_table], k=1)[0]
 
 async def process_reward(user_id: str, reward: dict):
     """Interprets the reward dict, picks specific brawlers, and updates DB."""
@@ -46,12 +54,12 @@ async def process_reward(user_id: str, reward: dict):
         rarity_key = raw_rarity.lower().replace(" ", "_")
         rarity_emoji = EMOJIS_RARITIES.get(rarity_key, "🥊")
 
-        eligible = [b for b in BRAWLER_ROSTER if b.rarity.lower() == formatted_rarity.lower()]
+        eligible = [b for b in roster.BRAWLER_ROSTER if b.rarity.lower() == formatted_rarity.lower()]
         
         if not eligible:
             return f"❌ Error: No brawlers found for rarity '{formatted_rarity}'"
 
-        selected_brawler = random.choice(eligible)
+        selected_brawler = rng.choice(eligible)
         status = await add_brawler_to_user(user_id, selected_brawler.id.lower())
         
         # Get the specific brawler emoji
@@ -83,7 +91,7 @@ async def process_reward(user_id: str, reward: dict):
         eligible = []
         for b_id, data in owned_brawlers.items():
             # Robust matching: ensure b_id from DB matches roster
-            b_info = next((b for b in BRAWLER_ROSTER if b.id.lower() == b_id.lower()), None)
+            b_info = next((b for b in roster.BRAWLER_ROSTER if b.id.lower() == b_id.lower()), None)
             if not b_info: continue
             
             b_level = data.get("level", 1)
@@ -103,7 +111,7 @@ async def process_reward(user_id: str, reward: dict):
                 if b_level >= req_lvl and len(current_owned) < len(master_list):
                     missing = [item for item in master_list if item not in current_owned]
                     if missing:
-                        eligible.append((b_id, b_info.name, random.choice(missing)))
+                        eligible.append((b_id, b_info.name, rng.choice(missing)))
 
         if not eligible:
             coin_icon = EMOJIS_CURRENCY.get("coins", "💰")
@@ -111,7 +119,7 @@ async def process_reward(user_id: str, reward: dict):
             return f"{coin_icon} **1,000 Coins** (No eligible brawlers)"
 
         # Select winner
-        target_b_id, b_name, choice = random.choice(eligible)
+        target_b_id, b_name, choice = rng.choice(eligible)
         
         if r_type == "hypercharge":
             await add_hypercharge_to_user(user_id, target_b_id, choice)
@@ -129,21 +137,19 @@ async def open_mega_box(user_id: str):
     """Opens a Mega Box with 10 items."""
     rewards_log = []
     for _ in range(10):
-        item = pick_weighted_item(MEGA_BOX_LOOT)
+        item = MEGA_BOX_SAMPLER.draw()
         msg = await process_reward(user_id, item)
         rewards_log.append(msg)
     return rewards_log
 
 async def open_starr_drop(user_id: str):
     """Rolls rarity, then rolls reward from that rarity."""
-    rarity_names = list(STARR_DROP_RARITIES.keys())
-    rarity_weights = list(STARR_DROP_RARITIES.values())
-    rarity = random.choices(rarity_names, weights=rarity_weights, k=1)[0]
+    rarity = STARR_DROP_RARITY_SAMPLER.draw()
     
-    loot_table = STARR_DROP_LOOT.get(rarity)
-    if not loot_table: return rarity, "Error: Empty Loot Table"
+    sampler = STARR_DROP_SAMPLERS.get(rarity)
+    if not sampler: return rarity, "Error: Empty Loot Table"
         
-    item = pick_weighted_item(loot_table)
+    item = sampler.draw()
     reward_msg = await process_reward(user_id, item)
     
     return rarity, reward_msg
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Wipes a channel by recreating it instead of deleting its messages one by one.
+
+channel.purge() can only bulk-delete messages younger than 14 days; anything older
+costs one DELETE per message. Recreating the channel (same overwrites, category,
+position, topic and slowmode) and deleting the original is two calls regardless of
+history. The replacement gets a new ID, so configured IDs are remapped and the map is
+persisted in settings - look reset-able channels up through resolve_channel_id().
+
+If the original can't be deleted after the copy is live, the copy stays mapped, the
+original is queued (also persisted) and its delete is retried on the next reset in
+that guild; the caller gets ChannelResetIncomplete so it can tell staff.
+"""
+import json
+
+import discord
+
+from database.mongo import get_setting, set_setting
+
+REMAP_SETTING_KEY = "channel_remap"
+ORPHANS_SETTING_KEY = "channel_reset_orphans"
+
+# configured channel id -> id of the channel currently standing in for it
+_channel_remap: dict[int, int] = {}
+# replaced channels whose delete failed, retried on the next reset
+_orphaned_channels: set[int] = set()
+
+
+class ChannelResetIncomplete(Exception):
+    """The empty copy is live and remapped, but the original couldn't be deleted."""
+
+    def __init__(self, new_channel: discord.TextChannel, old_channel_id: int, error: Exception):
+        self.new_channel = new_channel
+        self.old_channel_id = old_channel_id
+        super().__init__(
+            f"Old channel `{old_channel_id}` could not be deleted ({error}). "
+            f"{new_channel.mention} is in use; the delete is retried on the next reset, "
+            f"or remove the old channel by hand."
+        )
+
+
+async def load_channel_remap() -> int:
+    """Restores the remap and orphan queue from settings (called once at startup). Returns the remap size."""
+    raw = await get_setting(REMAP_SETTING_KEY)
+    _channel_remap.clear()
+    if raw:
+        try:
+            _channel_remap.update({int(k): int(v) for k, v in json.loads(raw).items()})
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"⚠️ Ignoring unreadable channel remap: {e}")
+
+    raw = await get_setting(ORPHANS_SETTING_KEY)
+    _orphaned_channels.clear()
+    if raw:
+        try:
+            _orphaned_channels.update(int(channel_id) for channel_id in json.loads(raw))
+        except (ValueError, TypeError) as e:
+            print(f"⚠️ Ignoring unreadable orphaned channel list: {e}")
+    if _orphaned_channels:
+        print(f"⚠️ {len(_orphaned_channels)} replaced channel(s) still waiting to be deleted")
+    return len(_channel_remap)
+
+
+async def _save_orphans():
+    try:
+        await set_setting(ORPHANS_SETTING_KEY, json.dumps(sorted(_orphaned_channels)))
+    except Exception as e:
+        print(f"⚠️ DB Error (Save Orphaned Channels): {e}")
+
+
+async def retry_orphan_deletes(guild: discord.Guild) -> int:
+    """Deletes the queued originals (the bot lives in one guild). Returns how many are gone now."""
+    cleared = 0
+    for channel_id in list(_orphaned_channels):
+        channel = guild.get_channel(channel_id)
+        if channel is not None:  # not cached = already deleted by hand
+            try:
+                await channel.delete(reason="Retrying delete of a reset channel")
+            except discord.NotFound:
+                pass
+            except discord.HTTPException as e:
+                print(f"⚠️ Still can't delete replaced channel {channel_id}: {e}")
+                continue
+        _orphaned_channels.discard(channel_id)
+        cleared += 1
+    if cleared:
+        await _save_orphans()
+    return cleared
+
+
+def resolve_channel_id(channel_id: int) -> int:
+    """Current ID for a configured channel (itself unless it has been reset)."""
+    return _channel_remap.get(channel_id, channel_id)
+
+
+async def reset_channel(
+    channel: discord.TextChannel,
+    *,
+    reason: str,
+    name: str | None = None,
+    overwrites: dict | None = None,
+) -> discord.TextChannel:
+    """
+    Replaces channel with an empty copy and returns the copy.
+    name/overwrites override the copied values, saving a follow-up edit.
+    Raises ChannelResetIncomplete (carrying the copy) if only the delete failed.
+    """
+    if _orphaned_channels:
+        await retry_orphan_deletes(channel.guild)
+
+    new_channel = await channel.guild.create_text_channel(
+        name=name or channel.name,
+        category=channel.category,
+        position=channel.position,
+        overwrites=channel.overwrites if overwrites is None else overwrites,
+        topic=channel.topic,
+        slowmode_delay=channel.slowmode_delay,
+        nsfw=channel.nsfw,
+        default_auto_archive_duration=channel.default_auto_archive_duration,
+        default_thread_slowmode_delay=channel.default_thread_slowmode_delay,
+        reason=reason,
+    )
+
+    # Repoint every configured ID that resolved to the old channel. Only original IDs
+    # are kept as keys, so the map doesn't grow with each reset.
+    remapped = False
+    for configured_id, current_id in list(_channel_remap.items()):
+        if current_id == channel.id:
+            _channel_remap[configured_id] = new_channel.id
+            remapped = True
+    if not remapped:
+        _channel_remap[channel.id] = new_channel.id
+
+    try:
+        await set_setting(REMAP_SETTING_KEY, json.dumps({str(k): v for k, v in _channel_remap.items()}))
+    except Exception as e:
+        print(f"⚠️ DB Error (Save Channel Remap): {e}")
+
+    try:
+        await channel.delete(reason=reason)
+    except discord.NotFound:
+        pass
+    except discord.HTTPException as e:
+        # The copy already serves the configured ID; keep that and queue the original
+        _orphaned_channels.add(channel.id)
+        await _save_orphans()
+        print(f"⚠️ Reset #{new_channel.name}: {channel.id} -> {new_channel.id}, but the original wasn't deleted: {e}")
+        raise ChannelResetIncomplete(new_channel, channel.id, e) from e
+
+    print(f"♻️ Reset #{new_channel.name}: {channel.id} -> {new_channel.id}")
+    return new_channel
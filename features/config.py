@@ -460,4 +460,36 @@ BRAWLER_UPGRADE_COSTS = {
     11: {"pp": 1440, "coins": 2800}
 }
 
-BOT_VERSION = "v1.3.0"
\ No newline at end of file
+BOT_VERSION = "v1.3.0"
+
+# --- TRANSLATION CACHE ---
+# Max phrases kept in memory, how long a cached translation stays valid,
+# and whether results are also stored in Mongo (survives restarts).
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "2000"))
+TRANSLATION_CACHE_TTL = int(os.getenv("TRANSLATION_CACHE_TTL", str(7 * 24 * 3600)))
+TRANSLATION_CACHE_PERSIST = os.getenv("TRANSLATION_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+
+# --- TRANSLATION BACKEND ---
+# 'google' = deep_translator + langdetect (network)
+# 'local'  = deterministic offline stand-in for load tests / benchmarks
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "google").lower()
+TRANSLATION_LOCAL_LATENCY_MS = float(os.getenv("TRANSLATION_LOCAL_LATENCY_MS", "0"))
+# Dedicated thread pool for translation/detection calls
+TRANSLATION_WORKERS = int(os.getenv("TRANSLATION_WORKERS", "4"))
+TRANSLATION_MAX_QUEUE = int(os.getenv("TRANSLATION_MAX_QUEUE", "100"))
+TRANSLATION_TIMEOUT = float(os.getenv("TRANSLATION_TIMEOUT", "10"))
+
+# --- PERF MONITORING ---
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))     # seconds between loop-lag samples
+LOOP_LAG_ALERT_MS = float(os.getenv("LOOP_LAG_ALERT_MS", "1000"))     # alert tourney admins above this during a tourney
+LOOP_LAG_ALERT_COOLDOWN = int(os.getenv("LOOP_LAG_ALERT_COOLDOWN", "300"))
+SLOW_HANDLER_MS = float(os.getenv("SLOW_HANDLER_MS", "500"))          # log listeners/commands slower than this
+
+# --- TICKET ARCHIVAL ---
+CLOSED_CATEGORY_LIMIT = 50  # Discord's hard per-category channel cap; !close archives inline at this size
+# archiver keeps each closed category at or below this (capped below the hard limit)
+CLOSED_ARCHIVE_LOW_WATER = min(int(os.getenv("CLOSED_ARCHIVE_LOW_WATER", "35")), CLOSED_CATEGORY_LIMIT - 1)
+CLOSED_ARCHIVE_INTERVAL = float(os.getenv("CLOSED_ARCHIVE_INTERVAL", "60"))  # seconds between sweeps when no close wakes it
+
+# --- TOURNEY STATS ---
+TOURNEY_STATS_FLUSH_INTERVAL = float(os.getenv("TOURNEY_STATS_FLUSH_INTERVAL", "5"))  # seconds between buffered message-count writes
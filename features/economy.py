@@ -3,7 +3,6 @@ import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 from datetime import datetime, timedelta
-import random
 from typing import Optional
 import asyncio
 
@@ -25,6 +24,12 @@ from features.config import (
     MODERATOR_ROLE_ID,
     TRIAL_MODERATOR_ROLE_ID,
 )
+from features.sampling import IntRangeSampler, rng
+from features.readiness import DB_READY, wait_until_ready
+
+# Supply drop rolls (shared seeded RNG, see features.sampling)
+SUPPLY_DROP_AMOUNT = IntRangeSampler(100, 300)
+SUPPLY_DROP_DELAY = IntRangeSampler(0, 45600)
 
 shop_choices = [
     app_commands.Choice(name=data['display'].replace("**", ""), value=key)
@@ -258,6 +263,7 @@ class Economy(commands.Cog):
     async def on_message(self, message: discord.Message):
         if message.author.bot: return
         if message.content.startswith('!'): return
+        if not await wait_until_ready(DB_READY): return
 
         user_id = str(message.author.id)
         current_timestamp = time.time()
@@ -293,14 +299,14 @@ class Economy(commands.Cog):
             should_award_tokens = True
 
         if should_award_tokens:
-            earned_tokens = random.randint(2, 5)
+            earned_tokens = rng.randint(2, 5)
 
             # Booster Bonus: 7% Chance (Avg 2% increase)
             SERVER_BOOSTER_ROLE_ID = 647685778255642626 
             if message.guild:
                 booster_role = message.guild.get_role(SERVER_BOOSTER_ROLE_ID)
                 if booster_role and booster_role in message.author.roles:
-                    if random.random() < 0.07:
+                    if rng.random() < 0.07:
                         earned_tokens += 1
 
             current_balance = await get_user_balance(user_id)
@@ -339,12 +345,12 @@ class Economy(commands.Cog):
     @tasks.loop(hours=6)
     async def supply_drop_task(self):
         await self.bot.wait_until_ready()
-        await asyncio.sleep(random.randint(0, 45600))
+        await asyncio.sleep(SUPPLY_DROP_DELAY.draw())
         
         channel = self.bot.get_channel(GENERAL_CHANNEL_ID)
         if not channel: return
 
-        amount = random.randint(100, 300)
+        amount = SUPPLY_DROP_AMOUNT.draw()
         embed = discord.Embed(
             title="🪂 Supply Drop Incoming!",
             description=f"A crate containing **{amount} R7 Tokens** has landed!\n\n**Click FAST to claim it!**",
@@ -556,7 +562,7 @@ class Economy(commands.Cog):
             return
 
         # 3. GRANT REWARD (If both checks pass)
-        daily_tokens = random.randint(80, 160)
+        daily_tokens = rng.randint(80, 160)
         level, _ = await get_leveling_data(user_id)
         bonus_multiplier = 1 + (level - 1) * 0.05
         final_tokens = int(daily_tokens * bonus_multiplier)
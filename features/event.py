@@ -1,3 +1,4 @@
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
@@ -5,6 +6,7 @@ from datetime import datetime, time
 import zoneinfo 
 import re 
 from database.mongo import get_user_balance, update_user_balance 
+from features.channel_reset import ChannelResetIncomplete, reset_channel, resolve_channel_id
 
 from features.config import (
     ADMIN_ROLE_ID, 
@@ -24,6 +26,16 @@ EVENT_CHANNELS = {
     "green": GREEN_EVENT_CHANNEL_ID
 }
 
+# --- OLDEST-MESSAGE WATERMARKS ---
+# configured channel id -> created_at of the oldest message (None = empty since its
+# last purge). Missing = unknown, learned with one history call on the next check.
+_oldest_message: dict[int, datetime | None] = {}
+
+STALE_AFTER_DAYS = 7  # cleanup warning threshold
+
+def mark_channel_cleared(channel_id: int):
+    _oldest_message[channel_id] = None
+
 class ClearChannelView(discord.ui.View):
     def __init__(self, channel_id: int):
         super().__init__(timeout=None) # Persistent view
@@ -59,7 +71,7 @@ class ClearChannelView(discord.ui.View):
             await interaction.response.send_message("❌ You do not have permission to use this.", ephemeral=True)
             return
 
-        channel = interaction.guild.get_channel(self.channel_id)
+        channel = interaction.guild.get_channel(resolve_channel_id(self.channel_id))
         if not channel:
             await interaction.response.send_message("❌ Channel no longer exists.", ephemeral=True)
             return
@@ -67,10 +79,15 @@ class ClearChannelView(discord.ui.View):
         # 2. Defer
         await interaction.response.defer()
 
-        # 3. Purge
+        # 3. Reset (recreate empty) - constant time however old the messages are
         try:
-            deleted = await channel.purge(limit=None)
-            count = len(deleted)
+            channel = await reset_channel(channel, reason=f"Event channel purge by {interaction.user}")
+            mark_channel_cleared(self.channel_id)
+        except ChannelResetIncomplete as e:
+            # Cleared copy is live; only the old channel is left behind
+            channel = e.new_channel
+            mark_channel_cleared(self.channel_id)
+            await interaction.followup.send(f"⚠️ {e}", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"❌ **Error:** Failed to purge channel. Reason: {e}", ephemeral=True)
             return
@@ -83,7 +100,6 @@ class ClearChannelView(discord.ui.View):
         embed.title = "✅ Purge Complete"
         embed.description = (
             f"{channel.mention} has been cleared.\n\n"
-            f"**Deleted:** {count} messages\n"
             f"**By:** {interaction.user.mention}"
         )
         
@@ -95,7 +111,7 @@ class ClearChannelView(discord.ui.View):
         
         # 5. Send PUBLIC Confirmation Message in Chat
         await interaction.followup.send(
-            f"🗑️ **Cleared!** {interaction.user.mention} purged **{count} messages** in {channel.mention}.", 
+            f"🗑️ **Cleared!** {interaction.user.mention} purged {channel.mention}.", 
             ephemeral=False
         )
         
@@ -196,7 +212,7 @@ class Events(commands.Cog):
             await interaction.response.send_message(f"❌ You can only use this command in <#{EVENT_STAFF_CHANNEL_ID}>.", ephemeral=True)
             return
 
-        target_channel = self.bot.get_channel(channel_id)
+        target_channel = self.bot.get_channel(resolve_channel_id(channel_id))
         if not target_channel:
             await interaction.response.send_message(f"❌ Error: Could not find #{color_name}-event channel.", ephemeral=True)
             return
@@ -204,13 +220,18 @@ class Events(commands.Cog):
         await interaction.response.defer(thinking=True) 
         
         try:
-            deleted = await target_channel.purge(limit=None)
+            try:
+                target_channel = await reset_channel(target_channel, reason=f"/clear-{color_name.lower()} by {interaction.user}")
+            except ChannelResetIncomplete as e:
+                target_channel = e.new_channel
+                await interaction.followup.send(f"⚠️ {e}")
+            mark_channel_cleared(channel_id)
             
             # 3. Send PUBLIC Confirmation
             await interaction.followup.send(
                 embed=discord.Embed(
                     title=f"🧹 {color_name} Event Cleared",
-                    description=f"✅ **Success!** Deleted **{len(deleted)}** messages in {target_channel.mention}.",
+                    description=f"✅ **Success!** {target_channel.mention} has been wiped clean.",
                     color=discord.Color.green()
                 )
             )
@@ -231,6 +252,41 @@ class Events(commands.Cog):
     async def clear_green(self, interaction: discord.Interaction):
         await self.execute_purge(interaction, GREEN_EVENT_CHANNEL_ID, "Green")
 
+    # --- WATERMARK TRACKING ---
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        # Only the first message after a purge moves the watermark
+        for channel_id in EVENT_CHANNELS.values():
+            if message.channel.id == resolve_channel_id(channel_id):
+                if channel_id in _oldest_message and _oldest_message[channel_id] is None:
+                    _oldest_message[channel_id] = message.created_at
+                return
+
+    def forget_watermark(self, channel_id: int):
+        # A manual delete may have removed the oldest message: relearn it on the next check
+        for configured_id in EVENT_CHANNELS.values():
+            if channel_id == resolve_channel_id(configured_id):
+                _oldest_message.pop(configured_id, None)
+                return
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        self.forget_watermark(payload.channel_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        self.forget_watermark(payload.channel_id)
+
+    async def oldest_message_time(self, channel_id: int, channel: discord.TextChannel) -> datetime | None:
+        """Watermark for the channel, falling back to one history call when it's unknown."""
+        if channel_id not in _oldest_message:
+            oldest = None
+            async for message in channel.history(limit=1, oldest_first=True):
+                oldest = message.created_at
+            _oldest_message[channel_id] = oldest
+        return _oldest_message[channel_id]
+
     # --- SCHEDULED TASK (12 AM ET) ---
     
     # ⚠️ FOR TESTING: Change to @tasks.loop(seconds=10)
@@ -244,38 +300,43 @@ class Events(commands.Cog):
             print("❌ Error: Event Staff channel not found for Cleanup Check.")
             return
 
-        for name, channel_id in EVENT_CHANNELS.items():
-            channel = self.bot.get_channel(channel_id)
-            if not channel: 
-                continue
+        # Channels are independent, so check them all at once
+        await asyncio.gather(*(
+            self.check_channel(name, channel_id, staff_channel)
+            for name, channel_id in EVENT_CHANNELS.items()
+        ))
 
-            try:
-                # Check only the single oldest message
-                async for message in channel.history(limit=1, oldest_first=True):
-                    
-                    msg_date = message.created_at
-                    if msg_date.tzinfo is None:
-                        msg_date = msg_date.replace(tzinfo=zoneinfo.ZoneInfo("UTC"))
-                    
-                    now_utc = datetime.now(zoneinfo.ZoneInfo("UTC"))
-                    age = now_utc - msg_date
-
-                    # ⚠️ FOR TESTING: Change to if age.days >= 0:
-                    if age.days >= 7:
-                        embed = discord.Embed(
-                            title="⚠️ Cleanup Warning",
-                            description=f"{channel.mention} has messages older than **{age.days} days**.",
-                            color=discord.Color.orange()
-                        )
-                        embed.add_field(name="Action Required", value="Discord cannot bulk delete messages >14 days old.\nPlease clear this channel soon.", inline=False)
-                        
-                        view = ClearChannelView(channel_id)
-                        await staff_channel.send(embed=embed, view=view)
-                        print(f"⚠️ Sent cleanup alert for #{name}-event")
-                    
-                    break 
-            except Exception as e:
-                print(f"Error checking history for #{name}-event: {e}")
+    async def check_channel(self, name: str, channel_id: int, staff_channel: discord.TextChannel):
+        channel = self.bot.get_channel(resolve_channel_id(channel_id))
+        if not channel:
+            return
+
+        try:
+            msg_date = await self.oldest_message_time(channel_id, channel)
+            if msg_date is None:
+                return
+            if msg_date.tzinfo is None:
+                msg_date = msg_date.replace(tzinfo=zoneinfo.ZoneInfo("UTC"))
+
+            now_utc = datetime.now(zoneinfo.ZoneInfo("UTC"))
+            age = now_utc - msg_date
+
+            # ⚠️ FOR TESTING: Change to if age.days >= 0:
+            if age.days < STALE_AFTER_DAYS:
+                return
+
+            embed = discord.Embed(
+                title="⚠️ Cleanup Warning",
+                description=f"{channel.mention} has messages older than **{age.days} days**.",
+                color=discord.Color.orange()
+            )
+            embed.add_field(name="Action Required", value="Please clear this channel soon.\nPurging recreates it empty, so message age doesn't matter.", inline=False)
+
+            view = ClearChannelView(channel_id)
+            await staff_channel.send(embed=embed, view=view)
+            print(f"⚠️ Sent cleanup alert for #{name}-event")
+        except Exception as e:
+            print(f"Error checking history for #{name}-event: {e}")
     
     @app_commands.command(name="event-rewards", description="ADMIN ONLY: Distribute tokens from an announcement.")
     @app_commands.describe(message_id="The ID of the message in #event-announcements")
@@ -356,9 +417,9 @@ class Events(commands.Cog):
 
         # --- Channel Management ---
         mgmt_text = (
-            f"`/clear-red` - Purge all messages in <#{RED_EVENT_CHANNEL_ID}>\n"
-            f"`/clear-blue` - Purge all messages in <#{BLUE_EVENT_CHANNEL_ID}>\n"
-            f"`/clear-green` - Purge all messages in <#{GREEN_EVENT_CHANNEL_ID}>\n"
+            f"`/clear-red` - Purge all messages in <#{resolve_channel_id(RED_EVENT_CHANNEL_ID)}>\n"
+            f"`/clear-blue` - Purge all messages in <#{resolve_channel_id(BLUE_EVENT_CHANNEL_ID)}>\n"
+            f"`/clear-green` - Purge all messages in <#{resolve_channel_id(GREEN_EVENT_CHANNEL_ID)}>\n"
             f"*Note: These commands must be run in <#{EVENT_STAFF_CHANNEL_ID}>.*"
         )
         embed.add_field(name="🧹 Manual Purge Commands", value=mgmt_text, inline=False)
@@ -369,7 +430,7 @@ class Events(commands.Cog):
             "If a channel is detected as 'stale', a **Cleanup Warning** will be posted here.\n\n"
             "**How to handle alerts:**\n"
             "Click the button on the alert embed to immediately purge that channel. "
-            "This keeps channels clean and prevents Discord's 14-day bulk-delete limitation."
+            "The channel is recreated empty (same name, permissions and position), so even very old messages are cleared instantly."
         )
         embed.add_field(name="⏲️ Automated Cleanup System", value=cleanup_text, inline=False)
 
@@ -0,0 +1,59 @@
+import functools
+import time
+from discord.ext import commands
+
+from database.instrumentation import HelperStats
+from features.config import SLOW_HANDLER_MS
+
+# --- HANDLER TIMING ---
+# "event:<name>" for listeners, "/<name>" for app commands, "!<name>" for prefix commands
+HANDLER_STATS: dict[str, HelperStats] = {}
+LOOP_LAG = HelperStats("loop_lag")
+
+def record_handler(name: str, elapsed: float, failed: bool = False):
+    HANDLER_STATS.setdefault(name, HelperStats(name)).record(elapsed, failed)
+    if elapsed * 1000 >= SLOW_HANDLER_MS:
+        print(f"🐢 Slow handler {name}: {elapsed * 1000:.0f}ms")
+
+
+class TimedListener:
+    """
+    Wraps a listener coroutine with timing. Compares equal to the original,
+    so bot.remove_listener() (e.g. on cog unload) still finds it.
+    """
+
+    def __init__(self, event_name: str, func):
+        self.func = func
+        owner = getattr(func, "__self__", None)
+        label = f"{type(owner).__name__}." if owner is not None else ""
+        self.stat_name = f"event:{event_name} ({label}{func.__name__})"
+        functools.update_wrapper(self, func)
+
+    async def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        failed = False
+        try:
+            return await self.func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            record_handler(self.stat_name, time.perf_counter() - start, failed)
+
+    def __eq__(self, other):
+        if isinstance(other, TimedListener):
+            other = other.func
+        return self.func == other
+
+    def __hash__(self):
+        return hash(self.func)
+
+def instrument_listeners(bot: commands.Bot) -> int:
+    """Wraps every registered listener (cogs + bot.listen) with timing. Returns how many were wrapped."""
+    wrapped = 0
+    for event_name, listeners in bot.extra_events.items():
+        for i, listener in enumerate(listeners):
+            if not isinstance(listener, TimedListener):
+                listeners[i] = TimedListener(event_name.removeprefix("on_"), listener)
+                wrapped += 1
+    return wrapped
@@ -0,0 +1,197 @@
+import asyncio
+import time
+import discord
+from discord import app_commands
+from discord.ext import commands, tasks
+
+from database.instrumentation import SLOW_QUERY_MS, get_stats, reset_stats
+from features.tourney.tourney_session import get_active_session_id
+from features.config import (
+    ADMIN_ROLE_ID, TOURNEY_ADMIN_CHANNEL_ID,
+    LOOP_LAG_INTERVAL, LOOP_LAG_ALERT_MS, LOOP_LAG_ALERT_COOLDOWN, SLOW_HANDLER_MS
+)
+# Stats live outside this extension so they survive reloads and main.py can wrap listeners
+from features.monitoring import HANDLER_STATS, LOOP_LAG, record_handler
+
+SORT_KEYS = {
+    "p95": lambda s: s["p95_ms"],
+    "calls": lambda s: s["calls"],
+    "total": lambda s: s["avg_ms"] * s["calls"],
+    "errors": lambda s: s["errors"],
+}
+
+
+def is_admin(interaction: discord.Interaction) -> bool:
+    return isinstance(interaction.user, discord.Member) and interaction.user.get_role(ADMIN_ROLE_ID) is not None
+
+
+class Perf(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self._interaction_starts: dict[int, float] = {}
+        self._last_lag_alert = 0.0
+        self._scheduled_tick = None
+        # Strong refs so pending alerts aren't garbage-collected mid-send
+        self._alert_tasks: set[asyncio.Task] = set()
+        self.loop_lag_monitor.start()
+
+    async def cog_unload(self):
+        self.loop_lag_monitor.cancel()
+        for task in list(self._alert_tasks):
+            task.cancel()
+
+    # --- LOOP LAG ---
+    @tasks.loop(seconds=LOOP_LAG_INTERVAL)
+    async def loop_lag_monitor(self):
+        """Measures how late the loop wakes us up compared to the scheduled tick."""
+        if self._scheduled_tick is not None:
+            lag = max(0.0, (discord.utils.utcnow() - self._scheduled_tick).total_seconds())
+            LOOP_LAG.record(lag, False)
+
+            if lag * 1000 >= LOOP_LAG_ALERT_MS:
+                print(f"⚠️ Event loop lag: {lag * 1000:.0f}ms")
+                task = asyncio.create_task(self.alert_lag(lag))
+                self._alert_tasks.add(task)
+                task.add_done_callback(self._alert_tasks.discard)
+        self._scheduled_tick = self.loop_lag_monitor.next_iteration
+
+    async def alert_lag(self, lag: float):
+        """Warns tourney admins about loop stalls, but only while a tournament is running."""
+        now = time.monotonic()
+        if now - self._last_lag_alert < LOOP_LAG_ALERT_COOLDOWN:
+            return
+        self._last_lag_alert = now
+
+        if get_active_session_id() is None:
+            return
+        channel = self.bot.get_channel(TOURNEY_ADMIN_CHANNEL_ID)
+        if not channel:
+            return
+
+        slowest = sorted(HANDLER_STATS.values(), key=lambda s: s.max, reverse=True)[:3]
+        culprits = "\n".join(f"• `{s.name}` max {s.max * 1000:.0f}ms" for s in slowest) or "No handler data yet."
+        embed = discord.Embed(
+            title="⚠️ Bot Lag Detected",
+            description=(
+                f"The event loop stalled for **{lag * 1000:.0f}ms** during the tournament.\n"
+                f"Ticket actions and commands may feel slow.\n\n**Slowest handlers:**\n{culprits}"
+            ),
+            color=discord.Color.orange()
+        )
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException:
+            pass
+
+    # --- COMMAND TIMING ---
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction):
+        if interaction.type == discord.InteractionType.application_command:
+            self._interaction_starts[interaction.id] = time.perf_counter()
+            # Drop stamps from commands that errored and never completed
+            if len(self._interaction_starts) > 1000:
+                cutoff = time.perf_counter() - 60
+                self._interaction_starts = {k: v for k, v in self._interaction_starts.items() if v > cutoff}
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        start = self._interaction_starts.pop(interaction.id, None)
+        if start is not None:
+            record_handler(f"/{command.qualified_name}", time.perf_counter() - start)
+
+    @commands.Cog.listener()
+    async def on_command(self, ctx: commands.Context):
+        ctx.perf_start = time.perf_counter()
+
+    @commands.Cog.listener()
+    async def on_command_completion(self, ctx: commands.Context):
+        start = getattr(ctx, "perf_start", None)
+        if start is not None:
+            record_handler(f"!{ctx.command.qualified_name}", time.perf_counter() - start)
+
+    perf = app_commands.Group(name="perf", description="ADMIN ONLY: Bot performance stats.")
+
+    @perf.command(name="db", description="ADMIN ONLY: Latency and error stats per database helper.")
+    @app_commands.describe(
+        sort="What to rank helpers by (default: p95 latency)",
+        reset="Clear the stats after showing them"
+    )
+    @app_commands.choices(sort=[app_commands.Choice(name=k, value=k) for k in SORT_KEYS])
+    async def perf_db(self, interaction: discord.Interaction, sort: str = "p95", reset: bool = False):
+        if not is_admin(interaction):
+            await interaction.response.send_message("❌ Permission Denied: Only Admins can view perf stats.", ephemeral=True)
+            return
+
+        rows = [(name, stats.summary()) for name, stats in get_stats().items() if stats.calls]
+        if not rows:
+            await interaction.response.send_message("📭 No database calls recorded yet.", ephemeral=True)
+            return
+
+        rows.sort(key=lambda r: SORT_KEYS[sort](r[1]), reverse=True)
+        total_calls = sum(s["calls"] for _, s in rows)
+        total_errors = sum(s["errors"] for _, s in rows)
+
+        lines = [f"{'helper':<28}{'calls':>7}{'err':>5}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, s in rows[:20]:
+            lines.append(
+                f"{name[:27]:<28}{s['calls']:>7}{s['errors']:>5}"
+                f"{s['p50_ms']:>7.0f}{s['p95_ms']:>7.0f}{s['p99_ms']:>7.0f}"
+            )
+
+        embed = discord.Embed(
+            title="🗄️ Database Helper Performance",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=discord.Color.dark_teal()
+        )
+        embed.set_footer(
+            text=f"{total_calls} calls • {total_errors} errors • times in ms • "
+                 f"slow log ≥ {SLOW_QUERY_MS:.0f}ms • sorted by {sort}"
+        )
+
+        if reset:
+            reset_stats()
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @perf.command(name="loop", description="ADMIN ONLY: Event-loop lag and the slowest listeners/commands.")
+    @app_commands.describe(reset="Clear the stats after showing them")
+    async def perf_loop(self, interaction: discord.Interaction, reset: bool = False):
+        if not is_admin(interaction):
+            await interaction.response.send_message("❌ Permission Denied: Only Admins can view perf stats.", ephemeral=True)
+            return
+
+        lag = LOOP_LAG.summary()
+        embed = discord.Embed(title="⏱️ Event Loop & Handler Performance", color=discord.Color.dark_teal())
+        embed.add_field(
+            name="Loop Lag",
+            value=(
+                f"p50 `{lag['p50_ms']:.1f}ms` • p95 `{lag['p95_ms']:.1f}ms` • "
+                f"p99 `{lag['p99_ms']:.1f}ms` • max `{lag['max_ms']:.0f}ms`\n"
+                f"{lag['calls']} samples every {LOOP_LAG_INTERVAL}s"
+            ),
+            inline=False
+        )
+
+        rows = sorted(HANDLER_STATS.values(), key=lambda s: s.percentile(95), reverse=True)[:15]
+        if rows:
+            lines = [f"{'handler':<34}{'calls':>6}{'err':>4}{'p95':>7}{'max':>7}"]
+            for s in rows:
+                summary = s.summary()
+                lines.append(
+                    f"{s.name[:33]:<34}{summary['calls']:>6}{summary['errors']:>4}"
+                    f"{summary['p95_ms']:>7.0f}{summary['max_ms']:>7.0f}"
+                )
+            embed.add_field(name="Slowest Handlers (ms)", value="```\n" + "\n".join(lines) + "\n```", inline=False)
+        embed.set_footer(text=f"Slow handler log ≥ {SLOW_HANDLER_MS:.0f}ms • alert ≥ {LOOP_LAG_ALERT_MS:.0f}ms lag")
+
+        if reset:
+            HANDLER_STATS.clear()
+            LOOP_LAG.samples.clear()
+            LOOP_LAG.calls = LOOP_LAG.errors = 0
+            LOOP_LAG.total = LOOP_LAG.max = 0.0
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(Perf(bot))
@@ -9,6 +9,7 @@ from database.mongo import (
     update_quest_progress, get_user_balance, update_user_balance,
     get_leveling_data, update_leveling_data
 )
+from features.readiness import DB_READY, wait_until_ready
 
 # --- DEFAULT QUESTS CONFIGURATION ---
 DEFAULT_QUESTS = [
@@ -97,6 +98,7 @@ class Quests(commands.Cog):
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         if message.author.bot: return
+        if not await wait_until_ready(DB_READY): return
         # Trigger message quest updates
         await self.process_quest_update(str(message.author.id), message.channel, "message")
 
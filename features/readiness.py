@@ -0,0 +1,29 @@
+import asyncio
+
+# --- READINESS GATES ---
+# Set by the boot pipeline in main.py (setup_hook). Event handlers await them
+# so nothing runs against a missing DB / cold cache.
+DB_READY = asyncio.Event()
+CACHES_READY = asyncio.Event()
+
+ALL_GATES = (DB_READY, CACHES_READY)
+
+
+def is_ready(*gates: asyncio.Event) -> bool:
+    return all(gate.is_set() for gate in (gates or ALL_GATES))
+
+
+async def wait_until_ready(*gates: asyncio.Event, timeout: float = 30.0) -> bool:
+    """
+    Waits for the given gates (default: all of them).
+    Returns False if they aren't set within `timeout` seconds.
+    """
+    gates = gates or ALL_GATES
+    if is_ready(*gates):
+        return True
+    try:
+        await asyncio.wait_for(asyncio.gather(*(gate.wait() for gate in gates)), timeout)
+        return True
+    except asyncio.TimeoutError:
+        print("⚠️ Readiness gate timed out, handler skipped.")
+        return False
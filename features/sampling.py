@@ -0,0 +1,101 @@
+import bisect
+import random
+from itertools import accumulate
+
+# Shared RNG for every loot/drop roll in the bot.
+# Tests and benchmarks call seed_rng() to make draws reproducible.
+rng = random.Random()
+
+
+def seed_rng(seed=None):
+    """Re-seeds the shared loot RNG (None = fresh OS entropy)."""
+    rng.seed(seed)
+
+
+class WeightedSampler:
+    """
+    Compiled weighted table built once at import.
+
+    Uses Vose's alias method so every draw is O(1), and keeps the
+    cumulative weights around for O(log n) lookups / probability checks.
+    """
+    __slots__ = ("items", "total", "cumulative", "_prob", "_alias")
+
+    def __init__(self, items, weights):
+        self.items = list(items)
+        weights = [float(w) for w in weights]
+        if not self.items or len(self.items) != len(weights):
+            raise ValueError("WeightedSampler needs one weight per item.")
+        if any(w < 0 for w in weights) or sum(weights) <= 0:
+            raise ValueError("WeightedSampler weights must be non-negative and sum above 0.")
+
+        self.cumulative = list(accumulate(weights))
+        self.total = self.cumulative[-1]
+
+        # --- Alias table construction (Vose) ---
+        n = len(weights)
+        scaled = [w * n / self.total for w in weights]
+        self._prob = [0.0] * n
+        self._alias = [0] * n
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            g = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = g
+            scaled[g] = (scaled[g] + scaled[s]) - 1.0
+            if scaled[g] < 1.0:
+                small.append(g)
+            else:
+                large.append(g)
+
+        # Leftovers are 1.0 (up to float error)
+        for i in large + small:
+            self._prob[i] = 1.0
+
+    @classmethod
+    def from_loot_table(cls, loot_table):
+        """Builds a sampler from a config list of dicts with a 'weight' key."""
+        return cls(loot_table, [item["weight"] for item in loot_table])
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Builds a sampler from a {item: weight} dict."""
+        return cls(mapping.keys(), mapping.values())
+
+    def draw(self, source=None):
+        """O(1) draw via the alias table."""
+        r = source or rng
+        i = int(r.random() * len(self._prob))
+        return self.items[i] if r.random() < self._prob[i] else self.items[self._alias[i]]
+
+    def draw_cumulative(self, source=None):
+        """O(log n) draw via binary search over the cumulative weights."""
+        r = source or rng
+        i = bisect.bisect_right(self.cumulative, r.random() * self.total)
+        return self.items[min(i, len(self.items) - 1)]
+
+    def probability(self, index: int) -> float:
+        """Chance of rolling the item at `index`."""
+        prev = self.cumulative[index - 1] if index > 0 else 0.0
+        return (self.cumulative[index] - prev) / self.total
+
+    def __len__(self):
+        return len(self.items)
+
+
+class IntRangeSampler:
+    """Uniform integer roll in [low, high], drawn from the shared RNG."""
+    __slots__ = ("low", "high")
+
+    def __init__(self, low: int, high: int):
+        if high < low:
+            raise ValueError("IntRangeSampler needs low <= high.")
+        self.low = low
+        self.high = high
+
+    def draw(self, source=None):
+        return (source or rng).randint(self.low, self.high)
@@ -8,7 +8,7 @@ import datetime
 from database.mongo import (
     add_payout_batch,         
     get_payout_logs,         
-    get_user_unpaid_batches, 
+    get_unpaid_recipients, 
     get_all_pending_payouts, 
     clear_pending_payout,
     add_blacklisted_user,
@@ -18,12 +18,14 @@ from database.mongo import (
     create_tourney_session,
     get_active_tourney_session,
     end_tourney_session,
-    increment_tourney_message_count,
     update_tourney_queue,
     increment_staff_closure,
     get_top_staff_stats
 )
 
+from features.readiness import CACHES_READY, wait_until_ready
+from features.channel_reset import ChannelResetIncomplete, reset_channel, resolve_channel_id
+
 # Import Config and Utils
 from features.config import (
     ALLOWED_STAFF_ROLES,
@@ -37,14 +39,30 @@ from features.config import (
     TOURNEY_CLOSED_CATEGORY_ID,
     PRE_TOURNEY_CLOSED_CATEGORY_ID,
     HALL_OF_FAME_CHANNEL_ID,
-    BOT_VERSION
+    BOT_VERSION,
+    CLOSED_ARCHIVE_INTERVAL,
+    TOURNEY_STATS_FLUSH_INTERVAL,
 )
 from .tourney_utils import (
+    cache_blacklist_entry,
+    uncache_blacklist_entry,
     close_ticket_via_command,
     reset_ticket_counter,
     delete_ticket_with_transcript,
     delete_ticket_via_command,
-    reopen_ticket_via_command
+    reopen_ticket_via_command,
+    ticket_lock,
+    archive_closed_overflow,
+    rebuild_closed_index,
+    request_archive,
+    wait_for_archive_request,
+)
+from .tourney_session import (
+    get_active_session_id,
+    set_active_session,
+    clear_active_session,
+    count_ticket_message,
+    flush_message_count,
 )
 from .tourney_views import TourneyOpenTicketView, PreTourneyOpenTicketView
 
@@ -52,6 +70,38 @@ from .tourney_views import TourneyOpenTicketView, PreTourneyOpenTicketView
 lock_tasks: dict[int, asyncio.Task] = {}
 LOCK_DURATION_HOURS = 6
 
+QUEUE_BARS = "▁▂▃▄▅▆▇█"
+
+def format_queue_timeline(series: dict, width: int = 30) -> str | None:
+    """Sparkline of a session's per-minute queue_series (minutes without changes carry the last depth)."""
+    if not series:
+        return None
+    keys = sorted(series)
+    start = datetime.datetime.strptime(keys[0], "%Y-%m-%dT%H:%M")
+    end = datetime.datetime.strptime(keys[-1], "%Y-%m-%dT%H:%M")
+    total = int((end - start).total_seconds() // 60) + 1
+
+    depths = []
+    last = 0
+    for i in range(total):
+        bucket = series.get((start + datetime.timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M"))
+        if bucket:
+            depths.append(bucket.get("max", 0))
+            last = bucket.get("last", 0)
+        else:
+            depths.append(last)
+
+    # One bar per `step` minutes, showing the deepest queue in that span
+    step = -(-total // width)
+    # Clamp: a stray negative depth (counter drift) must not index from the end of QUEUE_BARS
+    columns = [max(max(depths[i:i + step]), 0) for i in range(0, total, step)]
+    top = max(columns)
+    if top <= 0:
+        bars = QUEUE_BARS[0] * len(columns)
+    else:
+        bars = "".join(QUEUE_BARS[round(d / top * (len(QUEUE_BARS) - 1))] for d in columns)
+    return f"`{bars}`\n{start:%H:%M}–{end:%H:%M} UTC · {step} min/bar · peak {top}"
+
 def is_staff(member: discord.Member) -> bool:
     """Return True if the member has any of the allowed staff roles."""
     return any(role.id in ALLOWED_STAFF_ROLES for role in member.roles)
@@ -94,7 +144,7 @@ class QueueDashboard(commands.Cog):
             print("📊 Queue Dashboard Stopped")
         
         # Cleanup
-        channel = self.bot.get_channel(TOURNEY_SUPPORT_CHANNEL_ID)
+        channel = self.bot.get_channel(resolve_channel_id(TOURNEY_SUPPORT_CHANNEL_ID))
         if channel and isinstance(channel, discord.TextChannel):
             try:
                 async for m in channel.history(limit=10):
@@ -109,7 +159,7 @@ class QueueDashboard(commands.Cog):
         """Updates the live queue status in the main support channel."""
         await self.bot.wait_until_ready()
         
-        channel = self.bot.get_channel(TOURNEY_SUPPORT_CHANNEL_ID)
+        channel = self.bot.get_channel(resolve_channel_id(TOURNEY_SUPPORT_CHANNEL_ID))
         if not channel or not isinstance(channel, discord.TextChannel):
             return
 
@@ -255,13 +305,15 @@ class BlacklistGroup(app_commands.Group):
             raw_ids = re.findall(r'\d+', alts)
             alt_ids = list(set(raw_ids)) # unique IDs only
 
-        await add_blacklisted_user(
+        doc = await add_blacklisted_user(
             user_id=str(user.id),
             reason=reason,
             admin_id=str(interaction.user.id),
             matcherino=matcherino,
             alts=alt_ids
         )
+        if doc:
+            cache_blacklist_entry(doc)
 
         embed = discord.Embed(title="⛔ User Blacklisted", color=discord.Color.dark_red())
         embed.add_field(name="User", value=f"{user.mention} (`{user.id}`)", inline=False)
@@ -287,6 +339,7 @@ class BlacklistGroup(app_commands.Group):
             return
 
         await remove_blacklisted_user(str(user.id))
+        uncache_blacklist_entry(str(user.id))
         await interaction.response.send_message(f"✅ {user.mention} has been removed from the blacklist.")
 
     @app_commands.command(name="list", description="View all blacklisted users.")
@@ -319,16 +372,64 @@ class BlacklistGroup(app_commands.Group):
         embed.description = full_text
         await interaction.response.send_message(embed=embed)
                                     
+class ClosedTicketArchiver(commands.Cog):
+    """Keeps the closed ticket categories under the low-water mark in the background."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        self.archive_task.start()
+
+    def cog_unload(self):
+        self.archive_task.cancel()
+
+    @tasks.loop(seconds=1)
+    async def archive_task(self):
+        # Sleeps until a !close wakes it, or CLOSED_ARCHIVE_INTERVAL passes
+        await wait_for_archive_request(CLOSED_ARCHIVE_INTERVAL)
+        await self.bot.wait_until_ready()
+        try:
+            archived = await archive_closed_overflow(self.bot)
+            if archived:
+                print(f"🗄️ Archived {archived} closed ticket(s)")
+        except Exception as e:
+            print(f"⚠️ Closed ticket archiver error: {e}")
+
+    @archive_task.before_loop
+    async def before_archive_task(self):
+        # The in-memory index starts empty after a restart. Rebuild it from the channel
+        # cache (filled once the gateway is ready) and sweep right away.
+        await self.bot.wait_until_ready()
+        print(f"🗄️ Closed ticket index rebuilt ({rebuild_closed_index(self.bot)} tickets)")
+        request_archive()
+
+class TourneyStatsFlusher(commands.Cog):
+    """Writes the buffered ticket message count to the active session every few seconds."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def cog_load(self):
+        self.flush_task.start()
+
+    def cog_unload(self):
+        self.flush_task.cancel()
+
+    @tasks.loop(seconds=TOURNEY_STATS_FLUSH_INTERVAL)
+    async def flush_task(self):
+        await flush_message_count()
+
 def setup_tourney_commands(bot: commands.Bot):
     print("Setting up tourney commands...")
 
     @bot.command(name="close", aliases=["c"])
     async def close_command(ctx: commands.Context):
         """Close a tourney ticket (staff only)."""
-        active_session = await get_active_tourney_session()
-        if active_session:
-            await increment_staff_closure(active_session['_id'], ctx.author.id, ctx.author.name)
-            await update_tourney_queue(active_session['_id'], change=-1)
+        session_id = get_active_session_id()
+        if session_id is not None:
+            await increment_staff_closure(session_id, ctx.author.id, ctx.author.name)
+            await update_tourney_queue(session_id, change=-1)
         # -----------------------
         
         await close_ticket_via_command(ctx)
@@ -451,8 +552,8 @@ def setup_tourney_commands(bot: commands.Bot):
         Start a tourney:
         - Reset ticket counter.
         - Lock OTHER ticket channel.
-        - Setup Main Tourney Support (Open Perms, Send Panel, then Background Rename).
-        - Setup Pre-Tourney Support (Close Perms, Delete Tickets, then Background Rename).
+        - Reset Main Tourney Support (recreated with Open Perms + new name, then Send Panel).
+        - Reset Pre-Tourney Support (recreated with Closed Perms + new name), Delete Tickets.
         """
         # Staff-only
         if not isinstance(ctx.author, discord.Member) or not is_staff(ctx.author):
@@ -469,16 +570,17 @@ def setup_tourney_commands(bot: commands.Bot):
         existing_session = await get_active_tourney_session()
         if existing_session:
             await ctx.send("⚠ **Note:** A tournament session is already active in the database.")
+            set_active_session(existing_session['_id'])
         else:
-            await create_tourney_session()
+            set_active_session(await create_tourney_session())
 
         await lock_command(ctx)
 
         # 2. Update MAIN Tourney Support Channel
         # GOAL: 「🔴」tourney-support | Perms: Everyone View(/) Send(X)
-        main_channel = guild.get_channel(TOURNEY_SUPPORT_CHANNEL_ID)
+        main_channel = guild.get_channel(resolve_channel_id(TOURNEY_SUPPORT_CHANNEL_ID))
         if isinstance(main_channel, discord.TextChannel):
-            # A. Update Permissions & Purge (Critical - Do this first)
+            # A. Update Permissions, Rename & Wipe (Critical - Do this first)
             overwrites = main_channel.overwrites
             overwrites[guild.default_role] = discord.PermissionOverwrite(view_channel=True, send_messages=False)
             
@@ -487,8 +589,14 @@ def setup_tourney_commands(bot: commands.Bot):
                 if role:
                     overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
 
-            await main_channel.edit(overwrites=overwrites)
-            await main_channel.purge()
+            # Recreated empty with the new perms + name in one create call
+            try:
+                main_channel = await reset_channel(
+                    main_channel, reason="Tourney started", name="「🔴」tourney-support", overwrites=overwrites
+                )
+            except ChannelResetIncomplete as e:
+                main_channel = e.new_channel
+                await ctx.send(f"⚠️ {e}")
 
             # B. Send Panel (Critical)
             embed = discord.Embed(
@@ -511,17 +619,14 @@ def setup_tourney_commands(bot: commands.Bot):
                 color=discord.Color.blurple()
             )
             await main_channel.send(embed=embed, view=TourneyOpenTicketView())
-
-            # C. Attempt Rename (Background Task - Won't block if rate limited)
-            asyncio.create_task(main_channel.edit(name="「🔴」tourney-support"))
         else:
             await ctx.send(f"⚠️ Could not find Main Tourney Channel (ID: {TOURNEY_SUPPORT_CHANNEL_ID})")
 
         # 3. Update PRE-Tourney Support Channel
         # GOAL: 「❌❌❌」「🟡」pre-tourney-support | Perms: Everyone View(X)
-        pre_channel = guild.get_channel(PRE_TOURNEY_SUPPORT_CHANNEL_ID)
+        pre_channel = guild.get_channel(resolve_channel_id(PRE_TOURNEY_SUPPORT_CHANNEL_ID))
         if isinstance(pre_channel, discord.TextChannel):
-            # A. Update Permissions & Purge (Critical)
+            # A. Update Permissions, Rename & Wipe (Critical)
             overwrites = pre_channel.overwrites
             overwrites[guild.default_role] = discord.PermissionOverwrite(view_channel=False)
             
@@ -530,11 +635,13 @@ def setup_tourney_commands(bot: commands.Bot):
                 if role:
                     overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
 
-            await pre_channel.edit(overwrites=overwrites)
-            await pre_channel.purge() 
-
-            # B. Attempt Rename (Background Task)
-            asyncio.create_task(pre_channel.edit(name="「❌❌❌」「🟡」pre-tourney-support"))
+            try:
+                pre_channel = await reset_channel(
+                    pre_channel, reason="Tourney started", name="「❌❌❌」「🟡」pre-tourney-support", overwrites=overwrites
+                )
+            except ChannelResetIncomplete as e:
+                pre_channel = e.new_channel
+                await ctx.send(f"⚠️ {e}")
         else:
             await ctx.send(f"⚠️ Could not find Pre-Tourney Channel (ID: {PRE_TOURNEY_SUPPORT_CHANNEL_ID})")
 
@@ -546,7 +653,7 @@ def setup_tourney_commands(bot: commands.Bot):
             pre_category = guild.get_channel(cat_id)
             if isinstance(pre_category, discord.CategoryChannel):
                 for ch in pre_category.channels:
-                    if isinstance(ch, discord.TextChannel) and "ticket-" in ch.name and ch.id != PRE_TOURNEY_SUPPORT_CHANNEL_ID:
+                    if isinstance(ch, discord.TextChannel) and "ticket-" in ch.name and ch.id != resolve_channel_id(PRE_TOURNEY_SUPPORT_CHANNEL_ID):
                         try:
                             await delete_ticket_with_transcript(guild, ch, ctx.author, bot)
                             deleted_count += 1
@@ -565,8 +672,8 @@ def setup_tourney_commands(bot: commands.Bot):
         """
         End the tourney:
         - Reopen the "Other" ticket channel.
-        - Setup Main Tourney Support (Close Perms, then Background Rename).
-        - Setup Pre-Tourney Support (Open Perms, Send Panel, then Background Rename).
+        - Reset Main Tourney Support (recreated with Closed Perms + new name).
+        - Reset Pre-Tourney Support (recreated with Open Perms + new name, then Send Panel).
         - Close & delete all MAIN tourney tickets.
         """
         if not isinstance(ctx.author, discord.Member) or not is_staff(ctx.author):
@@ -581,7 +688,10 @@ def setup_tourney_commands(bot: commands.Bot):
         if guild is None:
             return
 
+        # Buffered message counts go in before the report reads them
+        await flush_message_count()
         session = await get_active_tourney_session()
+        clear_active_session()
         if session:
             # 1. Calculate Duration
             start_time = session['start_time']
@@ -610,6 +720,9 @@ def setup_tourney_commands(bot: commands.Bot):
             stat_embed.add_field(name="📩 Total Tickets", value=f"`{session['total_tickets']}`", inline=True)
             stat_embed.add_field(name="💬 Total Messages", value=f"`{session['total_messages']}`", inline=True)
             stat_embed.add_field(name="📈 Peak Queue", value=f"**{session['peak_queue']}** tickets", inline=False)
+            timeline = format_queue_timeline(session.get("queue_series"))
+            if timeline:
+                stat_embed.add_field(name="📉 Queue Over Time", value=timeline, inline=False)
             stat_embed.add_field(name="🏆 Top Tourney Admins", value=staff_msg, inline=False)
                         
             report_msg = await ctx.send(embed=stat_embed)
@@ -627,9 +740,9 @@ def setup_tourney_commands(bot: commands.Bot):
 
         # 1. Update MAIN Tourney Support Channel
         # GOAL: 「❌❌❌」「🔴」tourney-support | Perms: Everyone View(X)
-        main_channel = guild.get_channel(TOURNEY_SUPPORT_CHANNEL_ID)
+        main_channel = guild.get_channel(resolve_channel_id(TOURNEY_SUPPORT_CHANNEL_ID))
         if isinstance(main_channel, discord.TextChannel):
-            # A. Update Permissions & Purge (Critical)
+            # A. Update Permissions, Rename & Wipe (Critical)
             overwrites = main_channel.overwrites
             overwrites[guild.default_role] = discord.PermissionOverwrite(view_channel=False)
             
@@ -638,19 +751,21 @@ def setup_tourney_commands(bot: commands.Bot):
                 if role:
                     overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
 
-            await main_channel.edit(overwrites=overwrites)
-            await main_channel.purge()
-
-            # B. Attempt Rename (Background Task)
-            asyncio.create_task(main_channel.edit(name="「❌❌❌」「🔴」tourney-support"))
+            try:
+                main_channel = await reset_channel(
+                    main_channel, reason="Tourney ended", name="「❌❌❌」「🔴」tourney-support", overwrites=overwrites
+                )
+            except ChannelResetIncomplete as e:
+                main_channel = e.new_channel
+                await ctx.send(f"⚠️ {e}")
         else:
             await ctx.send(f"⚠️ Could not find Main Tourney Channel (ID: {TOURNEY_SUPPORT_CHANNEL_ID})")
 
         # 2. Update PRE-Tourney Support Channel
         # GOAL: 「🟡」pre-tourney-support | Perms: Everyone View(/) Send(X)
-        pre_channel = guild.get_channel(PRE_TOURNEY_SUPPORT_CHANNEL_ID)
+        pre_channel = guild.get_channel(resolve_channel_id(PRE_TOURNEY_SUPPORT_CHANNEL_ID))
         if isinstance(pre_channel, discord.TextChannel):
-            # A. Update Permissions & Purge (Critical)
+            # A. Update Permissions, Rename & Wipe (Critical)
             overwrites = pre_channel.overwrites
             overwrites[guild.default_role] = discord.PermissionOverwrite(view_channel=True, send_messages=False)
             
@@ -659,8 +774,13 @@ def setup_tourney_commands(bot: commands.Bot):
                 if role:
                     overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True)
 
-            await pre_channel.edit(overwrites=overwrites)
-            await pre_channel.purge()
+            try:
+                pre_channel = await reset_channel(
+                    pre_channel, reason="Tourney ended", name="「🟡」pre-tourney-support", overwrites=overwrites
+                )
+            except ChannelResetIncomplete as e:
+                pre_channel = e.new_channel
+                await ctx.send(f"⚠️ {e}")
 
             # B. Send Pre-Tourney Panel (Critical)
             embed = discord.Embed(
@@ -675,9 +795,6 @@ def setup_tourney_commands(bot: commands.Bot):
                 color=discord.Color.orange()
             )
             await pre_channel.send(embed=embed, view=PreTourneyOpenTicketView())
-
-            # C. Attempt Rename (Background Task)
-            asyncio.create_task(pre_channel.edit(name="「🟡」pre-tourney-support"))
         else:
             await ctx.send(f"⚠️ Could not find Pre-Tourney Channel (ID: {PRE_TOURNEY_SUPPORT_CHANNEL_ID})")
 
@@ -690,7 +807,7 @@ def setup_tourney_commands(bot: commands.Bot):
             if isinstance(cat, discord.CategoryChannel):
                 for ch in cat.channels:
                     # Delete if it's a ticket and NOT the support channel
-                    if isinstance(ch, discord.TextChannel) and "ticket-" in ch.name and ch.id != TOURNEY_SUPPORT_CHANNEL_ID:
+                    if isinstance(ch, discord.TextChannel) and "ticket-" in ch.name and ch.id != resolve_channel_id(TOURNEY_SUPPORT_CHANNEL_ID):
                         ticket_channels.append(ch)
 
         if not ticket_channels:
@@ -782,7 +899,9 @@ def setup_tourney_commands(bot: commands.Bot):
             await interaction.response.send_message("This command can only be used inside a tourney ticket channel.", ephemeral=True)
             return
 
-        await channel.set_permissions(user, view_channel=True, send_messages=True, read_message_history=True)
+        # Per-member edit: never rewrites overwrites a concurrent close/add/remove just set
+        async with ticket_lock(channel.id):
+            await channel.set_permissions(user, view_channel=True, send_messages=True, read_message_history=True)
         await interaction.response.send_message(f"✅ Added {user.mention} to this ticket.", ephemeral=True)
         await channel.send(f"{user.mention} has been added to this ticket by {interaction.user.mention}.")
     
@@ -805,7 +924,8 @@ def setup_tourney_commands(bot: commands.Bot):
             await interaction.response.send_message("This command can only be used inside a tourney ticket channel.", ephemeral=True)
             return
 
-        await channel.set_permissions(user, overwrite=None)
+        async with ticket_lock(channel.id):
+            await channel.set_permissions(user, overwrite=None)
         await interaction.response.send_message(f"✅ Removed {user.mention} from this ticket.", ephemeral=True)
         await channel.send(f"{user.mention} has been removed from this ticket by {interaction.user.mention}.")
 
@@ -988,20 +1108,22 @@ def setup_tourney_commands(bot: commands.Bot):
         embed = discord.Embed(title="📜 Group Payout History", color=discord.Color.gold())
         logs_found = False
 
-        for entry in logs:
-            # FILTER 1: Only show logs where multiple people were involved
-            if len(entry["user_ids"]) <= 1:
-                continue
+        # FILTER 1: Only show logs where multiple people were involved
+        logs = [entry for entry in logs if len(entry["user_ids"]) > 1]
 
+        # Logs carry their still-unpaid recipients; older ones are resolved in one query
+        legacy_ids = [entry.get("batch_id") for entry in logs if "unpaid_user_ids" not in entry]
+        legacy_unpaid = await get_unpaid_recipients(legacy_ids)
+
+        for entry in logs:
             batch_id = entry.get("batch_id")
-            active_users_display = []
+            if "unpaid_user_ids" in entry:
+                unpaid = set(entry["unpaid_user_ids"])
+            else:
+                unpaid = legacy_unpaid.get(batch_id, set())
 
-            # FILTER 2: Check who still has the receipt
-            for uid in entry["user_ids"]:
-                user_batches = await get_user_unpaid_batches(uid)
-                # If the batch_id is still in their list, they haven't been paid for this yet.
-                if batch_id in user_batches:
-                    active_users_display.append(f"<@{uid}>")
+            # FILTER 2: Check who still has the receipt (keeps the original order)
+            active_users_display = [f"<@{uid}>" for uid in entry["user_ids"] if uid in unpaid]
 
             # FILTER 3: If everyone in this log has been paid out, skip showing the log
             if not active_users_display:
@@ -1123,6 +1245,8 @@ def setup_tourney_commands(bot: commands.Bot):
    
     # --- Start the Dashboard Task ---
     asyncio.create_task(bot.add_cog(QueueDashboard(bot)))
+    asyncio.create_task(bot.add_cog(ClosedTicketArchiver(bot)))
+    asyncio.create_task(bot.add_cog(TourneyStatsFlusher(bot)))
     print("✅ Queue Dashboard task started.")
 
     bot.tree.add_command(tourney_panel)
@@ -1139,14 +1263,6 @@ def setup_tourney_commands(bot: commands.Bot):
     bot.tree.add_command(BlacklistGroup(bot))
 
 
-    async def background_stats_update():
-        try:
-            active = await get_active_tourney_session()
-            if active:
-                await increment_tourney_message_count(active['_id'])
-        except Exception:
-            pass 
-
     @bot.listen()
     async def on_message(message):
         if message.author.bot: return
@@ -1157,6 +1273,8 @@ def setup_tourney_commands(bot: commands.Bot):
         
         # Check conditions (Fast in-memory checks)
         if "ticket-" in message.channel.name and message.channel.category_id in valid_categories:
+            # Session id is restored during cache warm-up
+            if not await wait_until_ready(CACHES_READY): return
             
-            # This creates a background task so the bot doesn't wait for MongoDB.
-            asyncio.create_task(background_stats_update())
\ No newline at end of file
+            # Counted in memory; TourneyStatsFlusher writes it with one $inc every few seconds.
+            count_ticket_message()
@@ -0,0 +1,52 @@
+from database.mongo import get_active_tourney_session, increment_tourney_message_count
+
+# --- Active session cache ---
+# Set by !starttourney, cleared by !endtourney and restored from the DB at boot,
+# so the hot paths (ticket messages, !close, ticket creation) never look it up.
+
+_active_session_id = None
+
+# Ticket messages counted since the last flush
+_pending_messages: int = 0
+
+
+async def load_active_session():
+    """Restores the cached session id from the DB (called once at startup)."""
+    global _active_session_id
+    session = await get_active_tourney_session()
+    _active_session_id = session["_id"] if session else None
+    return _active_session_id
+
+
+def get_active_session_id():
+    return _active_session_id
+
+
+def set_active_session(session_id) -> None:
+    global _active_session_id, _pending_messages
+    _active_session_id = session_id
+    _pending_messages = 0
+
+
+def clear_active_session() -> None:
+    global _active_session_id, _pending_messages
+    _active_session_id = None
+    _pending_messages = 0
+
+
+def count_ticket_message() -> None:
+    """In-memory only; flush_message_count() writes the total with one $inc."""
+    global _pending_messages
+    if _active_session_id is not None:
+        _pending_messages += 1
+
+
+async def flush_message_count() -> int:
+    """Writes the buffered message count to the active session. Returns the amount flushed."""
+    global _pending_messages
+    amount = _pending_messages
+    if amount == 0 or _active_session_id is None:
+        return 0
+    _pending_messages = 0
+    await increment_tourney_message_count(_active_session_id, amount)
+    return amount
@@ -1,11 +1,13 @@
-import re
 import discord
 from discord.ext import commands
 import io
 from datetime import datetime, timedelta
 from discord.utils import utcnow
 import asyncio 
-from database.mongo import get_blacklisted_user
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from database.mongo import db, get_all_blacklisted_users
 from features.config import (
     TOURNEY_CATEGORY_ID, 
     PRE_TOURNEY_CATEGORY_ID, 
@@ -14,12 +16,254 @@ from features.config import (
     ALLOWED_STAFF_ROLES, 
     LOG_CHANNEL_ID,
     TOURNEY_ADMIN_CHANNEL_ID, 
-    TOURNEY_ADMIN_ROLE_ID
+    TOURNEY_ADMIN_ROLE_ID,
+    CLOSED_ARCHIVE_LOW_WATER,
+    CLOSED_CATEGORY_LIMIT,
 )
 
 _ticket_counter: int = 1
 _pre_tourney_ticket_counter: int = 1 
 
+# --- Blacklist cache ---
+# Loaded once at startup and kept in sync by /blacklist add|remove,
+# so ticket-open checks never hit the DB.
+
+# primary user_id -> blacklist document
+_blacklist: dict[str, dict] = {}
+# alt user_id -> every blacklisted primary that lists it (an alt can be shared)
+_blacklist_alt_index: dict[str, set[str]] = {}
+_blacklist_loaded: bool = False
+
+
+async def load_blacklist_cache() -> int:
+    """
+    (Re)builds the blacklist cache from the DB. Returns the number of entries.
+    If the read fails (or there's no DB) the cache stays unloaded and the next
+    ticket check tries again.
+    """
+    global _blacklist_loaded
+    if db is None:
+        print("⚠️ Blacklist cache not loaded: no database connection.")
+        return len(_blacklist)
+    try:
+        docs = await get_all_blacklisted_users()
+    except Exception as e:
+        print(f"⚠️ DB Error (Load Blacklist Cache): {e}")
+        return len(_blacklist)
+    _blacklist.clear()
+    _blacklist_alt_index.clear()
+    for doc in docs:
+        cache_blacklist_entry(doc)
+    _blacklist_loaded = True
+    return len(_blacklist)
+
+
+def cache_blacklist_entry(doc: dict) -> None:
+    """Adds or replaces one blacklist document (and its alts) in the cache."""
+    user_id = str(doc["_id"])
+    uncache_blacklist_entry(user_id)
+    _blacklist[user_id] = doc
+    for alt_id in doc.get("alts") or []:
+        _blacklist_alt_index.setdefault(str(alt_id), set()).add(user_id)
+
+
+def uncache_blacklist_entry(user_id: str) -> None:
+    old = _blacklist.pop(str(user_id), None)
+    if old:
+        for alt_id in old.get("alts") or []:
+            primaries = _blacklist_alt_index.get(str(alt_id))
+            if primaries is not None:
+                primaries.discard(str(user_id))
+                if not primaries:
+                    del _blacklist_alt_index[str(alt_id)]
+
+
+def lookup_blacklist(user_id) -> tuple[dict | None, bool]:
+    """
+    O(1) check. Returns (blacklist document, is_alt).
+    is_alt is True when user_id is a registered alt of the blacklisted user; when
+    several blacklisted users list it, the document is the first by ID (see
+    blacklisted_primaries_of for all of them).
+    """
+    user_id = str(user_id)
+    doc = _blacklist.get(user_id)
+    if doc:
+        return doc, False
+    primaries = blacklisted_primaries_of(user_id)
+    if primaries:
+        return _blacklist.get(primaries[0]), True
+    return None, False
+
+
+def blacklisted_primaries_of(alt_id) -> list[str]:
+    """Every blacklisted user that lists alt_id as an alt, sorted by ID."""
+    return sorted(_blacklist_alt_index.get(str(alt_id), ()))
+
+
+# --- Ticket metadata ---
+# Opener/team/bracket/issue per ticket channel. Filled when the ticket is created
+# and rebuilt from the channel topic the first time an older ticket is touched
+# after a restart. The topic is only a (possibly truncated) backup copy.
+
+TOPIC_MAX_LENGTH = 1024
+
+
+@dataclass(slots=True)
+class TicketMeta:
+    opener_id: int | None = None
+    team: str | None = None
+    bracket: str | None = None
+    issue: str | None = None
+
+    def to_topic(self) -> str:
+        parts = [f"tourney-opener:{self.opener_id}"]
+        if self.team is not None:
+            parts.append(f"team:{self.team}")
+        if self.bracket is not None:
+            parts.append(f"bracket:{self.bracket}")
+        if self.issue is not None:
+            # Issue goes last so it's the only field truncation can cut
+            parts.append(f"issue:{self.issue}")
+        return "|".join(parts)[:TOPIC_MAX_LENGTH]
+
+
+# channel_id -> TicketMeta
+_ticket_meta: dict[int, TicketMeta] = {}
+
+
+def parse_ticket_topic(topic: str | None) -> TicketMeta:
+    """Builds a TicketMeta from a 'tourney-opener:..|team:..|bracket:..|issue:..' topic."""
+    meta = TicketMeta()
+    if not topic:
+        return meta
+
+    rest = topic
+    while rest:
+        part, _, rest = rest.partition("|")
+        key, _, value = part.partition(":")
+        key = key.strip().lower()
+        if key == "tourney-opener":
+            try:
+                meta.opener_id = int(value.strip())
+            except ValueError:
+                meta.opener_id = None
+        elif key == "team":
+            meta.team = value.strip()
+        elif key in ("bracket", "match", "match number"):
+            meta.bracket = value.strip()
+        elif key == "issue":
+            # Free text, may itself contain '|'
+            meta.issue = f"{value}|{rest}" if rest else value
+            break
+    return meta
+
+
+def get_ticket_meta(channel: discord.abc.GuildChannel) -> TicketMeta:
+    """Cached metadata for a ticket channel (parsed from its topic on first use)."""
+    meta = _ticket_meta.get(channel.id)
+    if meta is None:
+        meta = _ticket_meta[channel.id] = parse_ticket_topic(getattr(channel, "topic", None))
+    return meta
+
+
+def set_ticket_meta(channel_id: int, meta: TicketMeta) -> None:
+    _ticket_meta[channel_id] = meta
+
+
+def forget_ticket_meta(channel_id: int) -> None:
+    _ticket_meta.pop(channel_id, None)
+
+
+# --- Closed ticket archival ---
+# Closed tickets per closed category, oldest first. !close appends and wakes the
+# archiver, which transcripts + deletes from the front until the category is back
+# at the low-water mark, so closing never waits on cleanup.
+
+# closed category_id -> OrderedDict[channel_id, closed_at]
+_closed_index: dict[int, OrderedDict] = {}
+_archive_wakeup = asyncio.Event()
+
+
+def _seed_closed_index(category: discord.CategoryChannel) -> OrderedDict:
+    """Indexes channels already in the category (creation order) that aren't tracked yet."""
+    index = _closed_index.setdefault(category.id, OrderedDict())
+    untracked = sorted(
+        (c for c in category.text_channels if c.id not in index),
+        key=lambda c: c.id,
+    )
+    for old in reversed(untracked):
+        # Anything found on the channel list predates what we've seen close
+        index[old.id] = 0.0
+        index.move_to_end(old.id, last=False)
+    return index
+
+
+def rebuild_closed_index(client: discord.Client) -> int:
+    """Re-seeds the index from the closed categories (after a restart it starts empty)."""
+    tracked = 0
+    for category_id in (TOURNEY_CLOSED_CATEGORY_ID, PRE_TOURNEY_CLOSED_CATEGORY_ID):
+        category = client.get_channel(category_id)
+        if isinstance(category, discord.CategoryChannel):
+            tracked += len(_seed_closed_index(category))
+    return tracked
+
+
+def index_closed_ticket(category_id: int, channel_id: int) -> None:
+    unindex_closed_ticket(channel_id)
+    _closed_index.setdefault(category_id, OrderedDict())[channel_id] = time.time()
+
+
+def unindex_closed_ticket(channel_id: int) -> None:
+    for index in _closed_index.values():
+        index.pop(channel_id, None)
+
+
+def request_archive() -> None:
+    """Wakes the archiver early (called after every close)."""
+    _archive_wakeup.set()
+
+
+async def wait_for_archive_request(timeout: float) -> None:
+    try:
+        await asyncio.wait_for(_archive_wakeup.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    _archive_wakeup.clear()
+
+
+async def archive_closed_overflow(
+    client: discord.Client,
+    low_water: int = CLOSED_ARCHIVE_LOW_WATER,
+    category_ids: tuple[int, ...] = (TOURNEY_CLOSED_CATEGORY_ID, PRE_TOURNEY_CLOSED_CATEGORY_ID),
+) -> int:
+    """Deletes (with transcripts) the oldest closed tickets above low_water. Returns the count."""
+    archived = 0
+    for category_id in category_ids:
+        category = client.get_channel(category_id)
+        if not isinstance(category, discord.CategoryChannel):
+            continue
+
+        guild = category.guild
+        index = _seed_closed_index(category)
+        while len(category.channels) > low_water:
+            if not index:
+                index = _seed_closed_index(category)
+                if not index:
+                    break
+            channel_id, _ = index.popitem(last=False)
+            channel = guild.get_channel(channel_id)
+            # Reopened / already deleted since it was indexed
+            if not isinstance(channel, discord.TextChannel) or channel.category_id != category_id:
+                continue
+            try:
+                await delete_ticket_with_transcript(guild, channel, client.user, client)
+                archived += 1
+                await asyncio.sleep(1.5)
+            except Exception as e:
+                print(f"Failed to auto-archive ticket {channel.name}: {e}")
+    return archived
+
+
 # --- Rate limiting for tourney tickets ---
 
 # Max number of *open* tickets a single user can have at once
@@ -117,6 +361,146 @@ def reset_ticket_counter():
     _ticket_counter = 1
 
 
+# --- Ticket state transitions ---
+# Close/reopen compute the full target state (category, overwrites) up front and
+# apply it with a single channel.edit.
+
+# Discord allows 2 renames per channel per 10 minutes and makes a rate-limited edit
+# wait it out, so renames never ride along in that edit: a background task applies
+# the latest name once a slot is free.
+_RENAME_LIMIT = 2
+_RENAME_WINDOW = 600
+_recent_renames: dict[int, list[float]] = {}
+# channel_id -> latest name still waiting for a rename slot, and the task applying it
+_pending_renames: dict[int, str] = {}
+_rename_tasks: dict[int, asyncio.Task] = {}
+# One state transition per ticket at a time, so overwrite maps aren't built from each other's stale state
+_ticket_locks: dict[int, asyncio.Lock] = {}
+
+
+def ticket_lock(channel_id: int) -> asyncio.Lock:
+    lock = _ticket_locks.get(channel_id)
+    if lock is None:
+        lock = _ticket_locks[channel_id] = asyncio.Lock()
+    return lock
+
+
+def _rename_delay(channel_id: int) -> float:
+    """Seconds until this channel has a free rename slot (0 = now)."""
+    now = time.monotonic()
+    stamps = [t for t in _recent_renames.get(channel_id, []) if now - t < _RENAME_WINDOW]
+    _recent_renames[channel_id] = stamps
+    if len(stamps) < _RENAME_LIMIT:
+        return 0.0
+    return stamps[-_RENAME_LIMIT] + _RENAME_WINDOW - now
+
+
+def _take_rename_slot(channel_id: int) -> bool:
+    allowed = _rename_delay(channel_id) == 0
+    if allowed:
+        _recent_renames[channel_id].append(time.monotonic())
+    return allowed
+
+
+def _ticket_name(channel: discord.TextChannel, emoji: str) -> str:
+    """Swaps the 「...」 status prefix of a ticket name."""
+    base_name = channel.name
+    if "「" in base_name and "」" in base_name:
+        base_name = base_name.split("」", 1)[1]
+    return f"「{emoji}」{base_name}"
+
+
+def _staff_overwrite() -> discord.PermissionOverwrite:
+    return discord.PermissionOverwrite(
+        view_channel=True,
+        send_messages=True,
+        read_message_history=True,
+        manage_messages=True,
+    )
+
+
+def member_overwrite() -> discord.PermissionOverwrite:
+    return discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True)
+
+
+def with_overwrite(
+    overwrites: dict,
+    target: discord.abc.Snowflake,
+    overwrite: discord.PermissionOverwrite | None,
+) -> dict:
+    """Copy of an overwrite map with target's entry replaced (or removed when None)."""
+    result = {key: value for key, value in overwrites.items() if key.id != target.id}
+    if overwrite is not None:
+        result[target] = overwrite
+    return result
+
+
+def _with_staff_overwrites(guild: discord.Guild, overwrites: dict) -> dict:
+    for role_id in ALLOWED_STAFF_ROLES:
+        role = guild.get_role(role_id)
+        if role is not None:
+            overwrites = with_overwrite(overwrites, role, _staff_overwrite())
+    return overwrites
+
+
+async def apply_ticket_state(
+    channel: discord.TextChannel,
+    *,
+    reason: str,
+    category: discord.CategoryChannel | None = None,
+    name: str | None = None,
+    overwrites: dict | None = None,
+    position: int | None = None,
+):
+    """
+    Applies every changed field in one channel.edit (position adds a move call);
+    the rename is queued separately so a rate-limited rename can't hold up the rest.
+    overwrites replaces the whole map - only pass it for full transitions (close/reopen)
+    and call it under ticket_lock(); single-member changes should use set_permissions.
+    """
+    changes = {}
+    if category is not None and channel.category_id != category.id:
+        changes["category"] = category
+    if position is not None:
+        changes["position"] = position
+    if overwrites is not None:
+        changes["overwrites"] = overwrites
+
+    if changes:
+        await channel.edit(reason=reason, **changes)
+    if name is not None and (name != channel.name or channel.id in _pending_renames):
+        _queue_rename(channel, name, reason)
+
+
+def _queue_rename(channel: discord.TextChannel, name: str, reason: str):
+    """Rate-limited rename in the background; only the latest queued name is applied."""
+    _pending_renames[channel.id] = name
+    if channel.id not in _rename_tasks:
+        _rename_tasks[channel.id] = asyncio.create_task(_apply_pending_renames(channel, reason))
+
+
+async def _apply_pending_renames(channel: discord.TextChannel, reason: str):
+    try:
+        while channel.id in _pending_renames:
+            delay = _rename_delay(channel.id)
+            if delay > 0:
+                # Names queued meanwhile replace this one; only the latest is sent
+                await asyncio.sleep(delay)
+                continue
+            name = _pending_renames.pop(channel.id)
+            if name == channel.name:
+                continue
+            _take_rename_slot(channel.id)
+            try:
+                await channel.edit(name=name, reason=reason)
+            except discord.NotFound:
+                _pending_renames.pop(channel.id, None)  # ticket deleted meanwhile
+            except discord.HTTPException as e:
+                print(f"⚠️ Failed to rename ticket {channel.id} to {name}: {e}")
+    finally:
+        _rename_tasks.pop(channel.id, None)
+
+
 async def _send_capacity_warning(guild: discord.Guild, category_name: str, count: int):
     """Sends a warning to the admin channel if capacity > 40."""
     admin_ch = guild.get_channel(TOURNEY_ADMIN_CHANNEL_ID)
@@ -175,41 +559,24 @@ async def create_tourney_ticket_channel(
     # Build permission overwrites
     overwrites: dict[discord.abc.Snowflake, discord.PermissionOverwrite] = {
         guild.default_role: discord.PermissionOverwrite(view_channel=False),
-        interaction.user: discord.PermissionOverwrite(
-            view_channel=True,
-            send_messages=True,
-            read_message_history=True,
-        ),
+        interaction.user: member_overwrite(),
     }
+    overwrites = _with_staff_overwrites(guild, overwrites)
 
-    for role_id in ALLOWED_STAFF_ROLES:
-        role = guild.get_role(role_id)
-        if role is not None:
-            overwrites[role] = discord.PermissionOverwrite(
-                view_channel=True,
-                send_messages=True,
-                read_message_history=True,
-                manage_messages=True,
-            )
+    meta = TicketMeta(opener_id=interaction.user.id, team=team_name, bracket=bracket, issue=issue)
 
+    # Topic (opener ID backup) and top position go in with the create call
     channel = await guild.create_text_channel(
         name=channel_name,
         category=category,
         overwrites=overwrites,
+        position=0,
+        topic=meta.to_topic(),
         reason=f"Tourney ticket from {interaction.user} (team {team_name})",
     )
-    # Force move to top
-    await channel.edit(position=0)
+    set_ticket_meta(channel.id, meta)
     
     _register_ticket_for_user(interaction.user.id, channel.id)
-    
-    topic = (
-        f"tourney-opener:{interaction.user.id}"
-        f"|team:{team_name}"
-        f"|bracket:{bracket}"
-        f"|issue:{issue}"
-    )
-    await channel.edit(topic=topic, reason="Store ticket opener ID")
 
     ticket_embed = discord.Embed(
         title="🎟️ New Tournament Ticket",
@@ -305,28 +672,24 @@ async def create_pre_tourney_ticket_channel(
     # (Keep the rest of your existing code here)
     overwrites = {
         guild.default_role: discord.PermissionOverwrite(view_channel=False),
-        interaction.user: discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True),
+        interaction.user: member_overwrite(),
     }
-
-    for role_id in ALLOWED_STAFF_ROLES:
-        role = guild.get_role(role_id)
-        if role:
-            overwrites[role] = discord.PermissionOverwrite(view_channel=True, send_messages=True, read_message_history=True, manage_messages=True)
+    overwrites = _with_staff_overwrites(guild, overwrites)
 
     display_team = team_name if team_name else "N/A"
+    meta = TicketMeta(opener_id=interaction.user.id, team=display_team, issue=issue)
 
     channel = await guild.create_text_channel(
         name=channel_name,
         category=category,
         overwrites=overwrites,
+        position=0,
+        topic=meta.to_topic(),
         reason=f"Pre-Tourney ticket from {interaction.user}",
     )
-    await channel.edit(position=0)
+    set_ticket_meta(channel.id, meta)
 
     _register_ticket_for_user(interaction.user.id, channel.id)
-    
-    topic = f"tourney-opener:{interaction.user.id}|team:{display_team}|issue:{issue}"
-    await channel.edit(topic=topic, reason="Store ticket opener ID")
 
     ticket_embed = discord.Embed(
         title="📩 New Pre-Tourney Inquiry",
@@ -346,9 +709,7 @@ async def close_ticket_via_command(ctx: commands.Context):
     """
     Handle the !close command:
     1. Check perms.
-    2. Move to CLOSED category.
-    3. Rename (background).
-    4. Lock perms.
+    2. Move to CLOSED category, rename and lock perms (single edit).
     """
     from .tourney_views import DeleteTicketView
 
@@ -374,81 +735,44 @@ async def close_ticket_via_command(ctx: commands.Context):
         return
 
     if target_category and isinstance(target_category, discord.CategoryChannel):
-        current_count = len(target_category.channels)
-        LIMIT = 40 
-        
-        if current_count >= LIMIT:
-            # Sort existing archive tickets by creation time (Oldest first)
-            existing_channels = [c for c in target_category.channels if isinstance(c, discord.TextChannel)]
-            existing_channels.sort(key=lambda c: c.created_at)
-
-            # Delete enough to get back to 39 (making room for the incoming one)
-            excess_amount = current_count - LIMIT + 1
-            to_delete = existing_channels[:excess_amount]
-
-            await ctx.send(f"🧹 Closed category full ({current_count}/50). Auto-cleaning {len(to_delete)} oldest closed ticket(s)...")
-
-            for old_chan in to_delete:
-                try:
-                    await delete_ticket_with_transcript(guild, old_chan, ctx.author, ctx.bot)
-                    await asyncio.sleep(1.5) 
-                except Exception as e:
-                    print(f"Failed to auto-clean ticket {old_chan.name}: {e}")
-    
-    # 1. Move Category (Await this first so it happens immediately)
-    if target_category and isinstance(target_category, discord.CategoryChannel):
-        await channel.edit(category=target_category)
+        # The archiver normally keeps this well below the cap; only if it has
+        # fallen behind do we make room inline.
+        if len(target_category.channels) >= CLOSED_CATEGORY_LIMIT:
+            await ctx.send(f"🧹 Closed category full ({len(target_category.channels)}/{CLOSED_CATEGORY_LIMIT}). Archiving the oldest closed ticket...")
+            await archive_closed_overflow(ctx.bot, CLOSED_CATEGORY_LIMIT - 1, (target_category.id,))
     
-
-    # 2. Handle Opener Tracking
-    opener_id: int | None = None
-    if channel.topic:
-        for part in channel.topic.split("|"):
-            key, _, value = part.partition(":")
-            if key == "tourney-opener":
-                try:
-                    opener_id = int(value)
-                except ValueError:
-                    opener_id = None
-                break
+    # 1. Handle Opener Tracking
+    opener_id = get_ticket_meta(channel).opener_id
 
     if opener_id is not None:
         _unregister_ticket_for_user(opener_id, channel.id)
 
-    # 3. Rename (Background)
-    base_name = channel.name
-    if "「" in base_name and "」" in base_name:
-        try:
-            base_name = base_name.split("」", 1)[1]
-        except IndexError:
-            pass 
-    new_name = f"「👍」{base_name}"
-    
-    if channel.name != new_name:
-        asyncio.create_task(channel.edit(name=new_name, reason="Tourney ticket closed"))
-
-    # 4. Update Permissions
-    if opener_id is not None:
-        opener = guild.get_member(opener_id)
-        if opener is not None:
-            overwrite = channel.overwrites_for(opener)
-            if not _is_staff(opener):
-                overwrite.send_messages = False
-            else:
-                overwrite.send_messages = None
-            overwrite.view_channel = True
-            await channel.set_permissions(opener, overwrite=overwrite)
-            
-    for role_id in ALLOWED_STAFF_ROLES:
-        staff_role = guild.get_role(role_id)
-        if staff_role is not None:
-            await channel.set_permissions(
-                staff_role,
-                view_channel=True,
-                send_messages=True,
-                read_message_history=True,
-                manage_messages=True
-            )
+    async with ticket_lock(channel.id):
+        # 2. Target permissions: opener goes read-only, staff keep full access
+        overwrites = channel.overwrites
+        if opener_id is not None:
+            opener = guild.get_member(opener_id)
+            if opener is not None:
+                overwrite = channel.overwrites_for(opener)
+                if not _is_staff(opener):
+                    overwrite.send_messages = False
+                else:
+                    overwrite.send_messages = None
+                overwrite.view_channel = True
+                overwrites = with_overwrite(overwrites, opener, overwrite)
+        overwrites = _with_staff_overwrites(guild, overwrites)
+
+        # 3. Move + rename + lock in one edit
+        await apply_ticket_state(
+            channel,
+            reason="Tourney ticket closed",
+            category=target_category if isinstance(target_category, discord.CategoryChannel) else None,
+            name=_ticket_name(channel, "👍"),
+            overwrites=overwrites,
+        )
+    if isinstance(target_category, discord.CategoryChannel):
+        index_closed_ticket(target_category.id, channel.id)
+        request_archive()
 
     await ctx.send(
         f"Ticket closed by {ctx.author.name} and moved to {target_category.name if target_category else 'closed category'}.",
@@ -457,22 +781,12 @@ async def close_ticket_via_command(ctx: commands.Context):
 
 async def build_transcript_text(channel: discord.TextChannel) -> str:
     """Collect all messages in the channel into a plain-text transcript,
-    with header info from the channel topic.
+    with header info from the ticket metadata.
     """
-    header_team = None
-    header_bracket = None
-    header_issue = None
-
-    # Parse topic for team / bracket / issue
-    if channel.topic:
-        for part in channel.topic.split("|"):
-            key, _, value = part.partition(":")
-            if key == "team":
-                header_team = value
-            elif key == "bracket":
-                header_bracket = value
-            elif key == "issue":
-                header_issue = value
+    meta = get_ticket_meta(channel)
+    header_team = meta.team
+    header_bracket = meta.bracket
+    header_issue = meta.issue
 
     lines: list[str] = []
 
@@ -517,16 +831,8 @@ async def delete_ticket_with_transcript(
     if channel.category_id not in valid_categories:
         return
 
-    opener_id: int | None = None
-    if channel.topic:
-        for part in channel.topic.split("|"):
-            key, _, value = part.partition(":")
-            if key == "tourney-opener":
-                try:
-                    opener_id = int(value)
-                except ValueError:
-                    opener_id = None
-                break
+    meta = get_ticket_meta(channel)
+    opener_id = meta.opener_id
     
     if opener_id is not None:
         _unregister_ticket_for_user(opener_id, channel.id)
@@ -568,24 +874,9 @@ async def delete_ticket_with_transcript(
         deleter_name = deleter.name 
         opener_mention = f"<@{opener_id}>" if opener_id is not None else "Unknown"
 
-        # 1. Extract Info from Topic
-        topic = channel.topic if channel.topic else ""
-        
-        # Default values
-        team_name = "N/A"
-        match_num = "N/A"
-
-        if topic:
-            # Pattern: Look for "team:" followed by anything until a "|" or End of Line
-            team_match = re.search(r"team:(.*?)(?:\||$)", topic, re.IGNORECASE)
-            
-            # Pattern: Look for "bracket:" OR "match:" followed by anything until "|" or End of Line
-            bracket_match = re.search(r"(?:bracket|match|match number):(.*?)(?:\||$)", topic, re.IGNORECASE)
-            
-            if team_match: 
-                team_name = team_match.group(1).strip()
-            if bracket_match: 
-                match_num = bracket_match.group(1).strip()
+        # 1. Ticket info
+        team_name = meta.team or "N/A"
+        match_num = meta.bracket or "N/A"
 
         # 👇 2. Update Content
         await log_channel.send(
@@ -598,14 +889,17 @@ async def delete_ticket_with_transcript(
         )
 
     await channel.delete(reason=f"Tourney ticket deleted by {deleter}")
+    forget_ticket_meta(channel.id)
+    unindex_closed_ticket(channel.id)
+    _ticket_locks.pop(channel.id, None)
+    _recent_renames.pop(channel.id, None)
+    _pending_renames.pop(channel.id, None)
 
 async def reopen_tourney_ticket(interaction: discord.Interaction):
     """
     Re-open a ticket:
     1. Check perms.
-    2. Move back to ACTIVE category (at TOP).
-    3. Rename (background).
-    4. Restore perms.
+    2. Move back to ACTIVE category (at TOP), rename and restore perms (single edit).
     """
     guild = interaction.guild
     channel = interaction.channel
@@ -634,7 +928,7 @@ async def reopen_tourney_ticket(interaction: discord.Interaction):
 
     await interaction.response.defer(ephemeral=True)
 
-    # 1. Move Category & Force Top Position
+    # 1. Capacity check on the destination category
     if target_category and isinstance(target_category, discord.CategoryChannel):
         
         # --- SAFETY CHECK: Is the active category full? ---
@@ -645,52 +939,38 @@ async def reopen_tourney_ticket(interaction: discord.Interaction):
             )
             return
         # --------------------------------------------------
-
-        # We edit category first
-        await channel.edit(category=target_category)
-        # Then force position 0
-        await channel.edit(position=0)
+    else:
+        target_category = None
 
     # 2. Register Opener
-    opener_id: int | None = None
-    if channel.topic:
-        for part in channel.topic.split("|"):
-            key, _, value = part.partition(":")
-            if key.strip() == "tourney-opener":
-                try:
-                    opener_id = int(value.strip())
-                except ValueError:
-                    opener_id = None
-                break
+    opener_id = get_ticket_meta(channel).opener_id
 
     if opener_id is not None:
         _register_ticket_for_user(opener_id, channel.id)
 
-    # 3. Rename (Background)
-    base_name = channel.name
-    if "「" in base_name and "」" in base_name:
-        base_name = base_name.split("」", 1)[1]
-    new_name = f"「❗」{base_name}"
-
-    if channel.name != new_name:
-        asyncio.create_task(channel.edit(name=new_name, reason="Tourney ticket reopened"))
-
-    # 4. Restore Perms
+    # 3. Restore Perms
     opener_mention = "the ticket owner"
-    if opener_id is not None:
-        opener = guild.get_member(opener_id)
-        if opener is not None:
-            opener_mention = opener.mention
-            try:
-                await channel.set_permissions(
-                    opener,
-                    view_channel=True,
-                    send_messages=True,
-                    read_message_history=True,
-                    reason="Ticket Reopened"
-                )
-            except discord.HTTPException as e:
-                print(f"[reopen_tourney_ticket] Failed to update perms: {e}")
+    opener = guild.get_member(opener_id) if opener_id is not None else None
+    if opener is not None:
+        opener_mention = opener.mention
+
+    # 4. Move to top + rename + restore perms in one edit
+    try:
+        async with ticket_lock(channel.id):
+            overwrites = None
+            if opener is not None:
+                overwrites = with_overwrite(channel.overwrites, opener, member_overwrite())
+            await apply_ticket_state(
+                channel,
+                reason="Tourney ticket reopened",
+                category=target_category,
+                position=0 if target_category else None,
+                name=_ticket_name(channel, "❗"),
+                overwrites=overwrites,
+            )
+        unindex_closed_ticket(channel.id)
+    except discord.HTTPException as e:
+        print(f"[reopen_tourney_ticket] Failed to update channel: {e}")
 
     embed = discord.Embed(
         title="🔓 Ticket Reopened",
@@ -799,39 +1079,32 @@ async def reopen_ticket_via_command(ctx: commands.Context):
         await ctx.reply(f"❌ Cannot reopen: The active category '{target_category.name}' is full (50/50).")
         return
 
-    # 1. Move
-    if target_category:
-        await channel.edit(category=target_category, position=0)
-
-    # 2. Register Opener
-    opener_id = None
-    if channel.topic:
-        for part in channel.topic.split("|"):
-            key, _, value = part.partition(":")
-            if key.strip() == "tourney-opener":
-                try: opener_id = int(value.strip())
-                except ValueError: pass
-                break
+    # 1. Register Opener
+    opener_id = get_ticket_meta(channel).opener_id
 
     if opener_id: 
         _register_ticket_for_user(opener_id, channel.id)
 
-    # 3. Rename
-    base_name = channel.name
-    if "「" in base_name and "」" in base_name: 
-        base_name = base_name.split("」", 1)[1]
-    new_name = f"「❗」{base_name}"
-
-    if channel.name != new_name:
-        asyncio.create_task(channel.edit(name=new_name, reason="Reopened via command"))
-
-    # 4. Restore Perms
+    # 2. Restore Perms
     opener_mention = "the ticket owner"
-    if opener_id:
-        opener = guild.get_member(opener_id)
+    opener = guild.get_member(opener_id) if opener_id else None
+    if opener:
+        opener_mention = opener.mention
+
+    # 3. Move + rename + restore perms in one edit
+    async with ticket_lock(channel.id):
+        overwrites = None
         if opener:
-            opener_mention = opener.mention
-            await channel.set_permissions(opener, view_channel=True, send_messages=True, read_message_history=True)
+            overwrites = with_overwrite(channel.overwrites, opener, member_overwrite())
+        await apply_ticket_state(
+            channel,
+            reason="Reopened via command",
+            category=target_category,
+            position=0 if target_category else None,
+            name=_ticket_name(channel, "❗"),
+            overwrites=overwrites,
+        )
+    unindex_closed_ticket(channel.id)
 
     embed = discord.Embed(
         title="🔓 Ticket Reopened",
@@ -848,9 +1121,12 @@ async def reopen_ticket_via_command(ctx: commands.Context):
 
 async def check_and_alert_blacklist(guild: discord.Guild, user: discord.User, ticket_channel: discord.TextChannel):
     """
-    Checks if a user is blacklisted. If so, pings admins in the admin channel.
+    Checks if a user (or a registered alt) is blacklisted. If so, pings admins in the admin channel.
     """
-    blacklist_data = await get_blacklisted_user(str(user.id))
+    if not _blacklist_loaded:
+        await load_blacklist_cache()
+
+    blacklist_data, is_alt = lookup_blacklist(user.id)
     
     if not blacklist_data:
         return # Not blacklisted, do nothing.
@@ -873,9 +1149,14 @@ async def check_and_alert_blacklist(guild: discord.Guild, user: discord.User, ti
     else:
         alt_str = "None"
 
+    description = f"**User:** {user.mention} (`{user.id}`)\n**Ticket:** {ticket_channel.mention}"
+    if is_alt:
+        primaries = blacklisted_primaries_of(user.id)
+        description += "\n**Alt of:** " + ", ".join(f"<@{pid}> (`{pid}`)" for pid in primaries)
+
     embed = discord.Embed(
-        title="🚨 Blacklisted User Opened Ticket",
-        description=f"**User:** {user.mention} (`{user.id}`)\n**Ticket:** {ticket_channel.mention}",
+        title="🚨 Blacklisted Alt Opened Ticket" if is_alt else "🚨 Blacklisted User Opened Ticket",
+        description=description,
         color=discord.Color.dark_red()
     )
     
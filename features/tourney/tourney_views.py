@@ -1,9 +1,9 @@
 import discord
 from database.mongo import (
-    get_active_tourney_session, 
     update_tourney_queue, 
     increment_staff_closure 
 )
+from .tourney_session import get_active_session_id
 
 class TourneyReportModal(discord.ui.Modal, title="Tourney Support"):
     def __init__(self):
@@ -44,9 +44,9 @@ class TourneyReportModal(discord.ui.Modal, title="Tourney Support"):
         )
         
         try:
-            active_session = await get_active_tourney_session()
-            if active_session:
-                await update_tourney_queue(active_session['_id'], change=1)
+            session_id = get_active_session_id()
+            if session_id is not None:
+                await update_tourney_queue(session_id, change=1)
         except Exception:
             pass
 
@@ -99,9 +99,9 @@ class PreTourneyReportModal(discord.ui.Modal, title="Pre-Tourney Support"):
         )
     
         try:
-            active_session = await get_active_tourney_session()
-            if active_session:
-                await update_tourney_queue(active_session['_id'], change=1)
+            session_id = get_active_session_id()
+            if session_id is not None:
+                await update_tourney_queue(session_id, change=1)
         except Exception:
             pass
 
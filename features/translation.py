@@ -2,10 +2,17 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import asyncio
-from deep_translator import GoogleTranslator
-from langdetect import detect, LangDetectException
+from datetime import datetime
+import hashlib
+import time
+import unicodedata
+from collections import OrderedDict
 from typing import List
 
+from database.mongo import get_cached_translation, save_cached_translation
+from features.config import TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_TTL, TRANSLATION_CACHE_PERSIST
+from features.translation_backends import TranslationBackend, TranslationExecutor, get_backend, get_executor, quick_detect
+
 # Complete dictionary of 55 languages
 LANG_MAP = {
     'af': 'Afrikaans', 'ar': 'Arabic', 'bg': 'Bulgarian', 'bn': 'Bengali',
@@ -24,9 +31,139 @@ LANG_MAP = {
     'zh-cn': 'Simplified Chinese', 'zh-tw': 'Traditional Chinese'
 }
 
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys (Unicode NFC, collapsed whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationCache:
+    """In-memory LRU cache with a per-entry TTL, keyed by (source, target, normalized text)."""
+
+    def __init__(self, max_size: int = 2000, ttl: float = 7 * 24 * 3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (expires_at, value)
+        self._entries: OrderedDict[tuple[str, str, str], tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def make_key(source: str, target: str, text: str) -> tuple[str, str, str]:
+        return (source, target, normalize_text(text))
+
+    @staticmethod
+    def storage_key(key: tuple[str, str, str]) -> str:
+        """Compact, fixed-length ID for the persistent (Mongo) copy of an entry."""
+        source, target, text = key
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        return f"{source}|{target}|{digest}"
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value: str, ttl: float | None = None):
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class Translation(commands.Cog):
-    def __init__(self, bot):
+    def __init__(self, bot, backend: TranslationBackend = None, executor: TranslationExecutor = None):
         self.bot = bot
+        self.backend = backend or get_backend()
+        self.executor = executor or get_executor()
+        self.cache = TranslationCache(TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_TTL)
+        # Strong refs to in-flight Mongo saves so they aren't garbage-collected before finishing
+        self._save_tasks: set[asyncio.Task] = set()
+
+    async def cog_unload(self):
+        if self._save_tasks:
+            await asyncio.gather(*self._save_tasks, return_exceptions=True)
+        self.executor.shutdown()
+
+    async def warm_up(self):
+        """Loads the language detector before the first !translate (called from setup_hook)."""
+        start = time.perf_counter()
+        await self.executor.run(("warm_up",), self.backend.warm_up)
+        print(f"🌐 Language detector warmed up in {time.perf_counter() - start:.2f}s")
+
+    # --- CACHED LOOKUPS ---
+    async def _cache_lookup(self, key) -> str | None:
+        """Memory cache, then the Mongo copy (optional). None on a miss."""
+        value = self.cache.get(key)
+        if value is not None or not TRANSLATION_CACHE_PERSIST:
+            return value
+
+        doc = await get_cached_translation(TranslationCache.storage_key(key))
+        if doc and doc.get("timestamp"):
+            age = (datetime.utcnow() - doc["timestamp"]).total_seconds()
+            if age < self.cache.ttl:
+                self.cache.set(key, doc["value"], ttl=self.cache.ttl - age)
+                return doc["value"]
+        return None
+
+    def _cache_store(self, key, value: str):
+        self.cache.set(key, value)
+        if TRANSLATION_CACHE_PERSIST:
+            task = asyncio.create_task(save_cached_translation(TranslationCache.storage_key(key), value))
+            self._save_tasks.add(task)
+            task.add_done_callback(self._save_tasks.discard)
+
+    async def _cached_call(self, key, func, *args) -> str:
+        """Memory cache -> Mongo cache (optional) -> blocking call on the translation pool."""
+        value = await self._cache_lookup(key)
+        if value is not None:
+            return value
+
+        value = await self.executor.run(key, func, *args)
+        self._cache_store(key, value)
+        return value
+
+    async def translate_text(self, source: str, target: str, text: str) -> str:
+        """Translates text, serving repeated phrases from the cache."""
+        key = TranslationCache.make_key(source, target, text)
+        return await self._cached_call(key, self.backend.translate, source, target, text)
+
+    async def detect_language(self, text: str) -> str:
+        """Detects the language code of text, serving repeated phrases from the cache."""
+        quick = quick_detect(text)
+        if quick:
+            return quick
+
+        key = TranslationCache.make_key("detect", "", text)
+        return await self._cached_call(key, self.backend.detect, text)
+
+    async def translate_many(self, source: str, target: str, texts: List[str]) -> List[str]:
+        """Translates several texts; only the cache misses go to the backend, in one batch call."""
+        keys = [TranslationCache.make_key(source, target, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found = dict(zip(unique_keys, await asyncio.gather(*(self._cache_lookup(key) for key in unique_keys))))
+
+        missing = {key: text for key, text in zip(keys, texts) if found[key] is None}
+        if missing:
+            translated = await self.executor.run(
+                ("batch", source, target, tuple(missing)),
+                self.backend.batch_translate, source, target, list(missing.values())
+            )
+            for key, value in zip(missing, translated):
+                self._cache_store(key, value)
+                found[key] = value
+        return [found[key] for key in keys]
 
     # --- AUTOCOMPLETE HANDLER ---
     async def language_autocomplete(
@@ -93,13 +230,10 @@ class Translation(commands.Cog):
         try:
             # If auto-detecting, we still want to know what it found for the embed title
             if source_code == "auto":
-                detected_code = await asyncio.to_thread(detect, text)
+                detected_code = await self.detect_language(text)
                 display_name = LANG_MAP.get(detected_code, detected_code.upper())
 
-            translated = await asyncio.to_thread(
-                GoogleTranslator(source=source_code, target='en').translate, 
-                text
-            )
+            translated = await self.translate_text(source_code, 'en', text)
             
             embed = discord.Embed(title=f"🌐 Translated from {display_name}", color=discord.Color.blue())
             
@@ -128,10 +262,7 @@ class Translation(commands.Cog):
             # Check if the code provided exists in our map
             target_lang_name = LANG_MAP.get(language, language.upper())
             
-            translated = await asyncio.to_thread(
-                GoogleTranslator(source='en', target=language).translate, 
-                phrase
-            )
+            translated = await self.translate_text('en', language, phrase)
 
             embed = discord.Embed(
                 title=f"🌐 Translated to {target_lang_name}",
@@ -0,0 +1,265 @@
+import asyncio
+import threading
+import time
+import unicodedata
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List
+
+from features.config import (
+    TRANSLATION_BACKEND, TRANSLATION_LOCAL_LATENCY_MS,
+    TRANSLATION_WORKERS, TRANSLATION_MAX_QUEUE, TRANSLATION_TIMEOUT
+)
+
+if TYPE_CHECKING:
+    from deep_translator import GoogleTranslator
+
+
+# --- SCRIPT FAST PATH ---
+# Unicode scripts that map to exactly one of our LANG_MAP languages.
+# Shared scripts (Latin, Cyrillic, Arabic, Devanagari) still go to langdetect.
+SCRIPT_LANGUAGES = (
+    ("HIRAGANA", "ja"), ("KATAKANA", "ja"), ("HANGUL", "ko"),
+    ("THAI", "th"), ("HEBREW", "he"), ("GREEK", "el"),
+    ("BENGALI", "bn"), ("GUJARATI", "gu"), ("GURMUKHI", "pa"),
+    ("TAMIL", "ta"), ("TELUGU", "te"), ("KANNADA", "kn"), ("MALAYALAM", "ml"),
+)
+
+def quick_detect(text: str) -> str | None:
+    """
+    Cheap script check for obvious cases. Returns a language code,
+    or None when full detection is needed.
+    """
+    if text.isascii():
+        # Pure ASCII could be any Latin-script language -> needs langdetect
+        return None
+
+    found = set()
+    has_han = False
+    for char in text:
+        if not char.isalpha() or char.isascii():
+            continue
+        name = unicodedata.name(char, "")
+        if name.startswith("CJK"):
+            has_han = True
+            continue
+        for script, code in SCRIPT_LANGUAGES:
+            if name.startswith(script):
+                found.add(code)
+                break
+        else:
+            # Letter from a shared script (Cyrillic, Arabic, accented Latin...)
+            return None
+
+    if len(found) == 1:
+        return found.pop()
+    if not found and has_han:
+        # Kana would have marked it as Japanese; Han alone reads as Chinese
+        return "zh-cn"
+    return None
+
+
+class TranslationBackend:
+    """
+    Interface every translation backend implements.
+
+    Methods are blocking; the cog runs them off the event loop.
+    """
+    name = "base"
+
+    def translate(self, source: str, target: str, text: str) -> str:
+        raise NotImplementedError
+
+    def detect(self, text: str) -> str:
+        raise NotImplementedError
+
+    def batch_translate(self, source: str, target: str, texts: List[str]) -> List[str]:
+        return [self.translate(source, target, text) for text in texts]
+
+    def warm_up(self):
+        """Loads anything slow ahead of the first real request."""
+        pass
+
+
+def _langdetect():
+    """
+    Imports langdetect on first use (keeps it off the startup path).
+    langdetect is random by default; a fixed seed makes the same text always
+    detect as the same language.
+    """
+    from langdetect import DetectorFactory, detect
+    DetectorFactory.seed = 0
+    return detect
+
+
+class GoogleBackend(TranslationBackend):
+    """
+    deep_translator's GoogleTranslator + langdetect (needs network).
+    Both libraries are imported on first use, not at startup.
+    """
+    name = "google"
+
+    def __init__(self):
+        # GoogleTranslator keeps per-request state on the instance, so instances are
+        # reused per (source, target) pair but never shared between worker threads.
+        self._local = threading.local()
+
+    def get_translator(self, source: str, target: str) -> "GoogleTranslator":
+        """Returns this thread's reusable translator for a language pair."""
+        translators = getattr(self._local, "translators", None)
+        if translators is None:
+            translators = self._local.translators = {}
+        translator = translators.get((source, target))
+        if translator is None:
+            from deep_translator import GoogleTranslator
+            translator = translators[(source, target)] = GoogleTranslator(source=source, target=target)
+        return translator
+
+    def translate(self, source, target, text):
+        return self.get_translator(source, target).translate(text)
+
+    def detect(self, text):
+        return _langdetect()(text)
+
+    def batch_translate(self, source, target, texts):
+        return self.get_translator(source, target).translate_batch(texts)
+
+    def warm_up(self):
+        # Pay the imports and the profile load (~0.5s total) before the first user does
+        import deep_translator  # noqa: F401
+        self.detect("warm up the language profiles")
+
+
+class LocalBackend(TranslationBackend):
+    """
+    Deterministic offline stand-in.
+
+    Same input always gives the same output, and an optional sleep
+    simulates the latency of a real API call.
+    """
+    name = "local"
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+
+    def _wait(self):
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def translate(self, source, target, text):
+        self._wait()
+        return f"[{source}->{target}] {text}"
+
+    def detect(self, text):
+        self._wait()
+        # Stable pseudo-detection so repeated phrases always agree
+        codes = ("en", "es", "fr", "de", "pt")
+        return codes[zlib.crc32(text.encode("utf-8")) % len(codes)]
+
+    def batch_translate(self, source, target, texts):
+        # One simulated round-trip for the whole batch, like a real batch API
+        self._wait()
+        return [f"[{source}->{target}] {text}" for text in texts]
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "local": LocalBackend,
+}
+
+def get_backend(name: str = None) -> TranslationBackend:
+    """Builds the backend picked by TRANSLATION_BACKEND (or `name`)."""
+    name = (name or TRANSLATION_BACKEND).lower()
+    if name not in BACKENDS:
+        print(f"⚠️ Unknown TRANSLATION_BACKEND '{name}', falling back to google.")
+        name = "google"
+    if name == "local":
+        return LocalBackend(TRANSLATION_LOCAL_LATENCY_MS)
+    return BACKENDS[name]()
+
+
+# --- EXECUTOR ---
+class TranslationBusy(RuntimeError):
+    """Raised when the translation queue is full."""
+
+
+class TranslationTimeout(RuntimeError):
+    """Raised when a translation call takes longer than the timeout."""
+
+
+class TranslationExecutor:
+    """
+    Size-limited thread pool reserved for blocking translation/detection calls,
+    so slow API calls can't starve other `asyncio.to_thread` users.
+
+    Identical in-flight requests (same key) share one future.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 100, timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="translate")
+        self._inflight: dict = {}
+
+        # Metrics
+        self.pending = 0          # submitted to the pool and not finished yet
+        self.peak_pending = 0
+        self.submitted = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker thread."""
+        return max(0, self.pending - self.max_workers)
+
+    def _on_done(self, key, future):
+        self.pending -= 1
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def run(self, key, func, *args):
+        """Runs func(*args) on the pool, joining an identical in-flight call if there is one."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise TranslationBusy("Translation is busy right now, try again in a moment.")
+
+            future = asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+            self._inflight[key] = future
+            self.pending += 1
+            self.submitted += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+            future.add_done_callback(lambda f, k=key: self._on_done(k, f))
+
+        try:
+            # shield: one caller timing out must not cancel the call for the others
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TranslationTimeout("Translation service timed out, try again.") from None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "pending": self.pending,
+            "queue_depth": self.queue_depth,
+            "peak_pending": self.peak_pending,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_executor() -> TranslationExecutor:
+    """Builds the executor with the TRANSLATION_* limits from config."""
+    return TranslationExecutor(TRANSLATION_WORKERS, TRANSLATION_MAX_QUEUE, TRANSLATION_TIMEOUT)
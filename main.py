@@ -1,15 +1,25 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
+import asyncio
+import hashlib
+import json
 import os
+import time
 from dotenv import load_dotenv
 
 # Import Tourney Logic (Legacy/Features folder)
 from features.tourney.tourney_commands import setup_tourney_commands
+from features.tourney.tourney_utils import load_blacklist_cache
+from features.tourney.tourney_session import load_active_session
+from features.channel_reset import load_channel_remap
 
 # Import Database connection check
-from database.mongo import db
+from database.mongo import db, get_setting, set_setting, ping_database, ensure_indexes
 
 from features.config import EMOJIS_BRAWLERS 
+from features.readiness import DB_READY, CACHES_READY, wait_until_ready
+from features.monitoring import instrument_listeners
 
 load_dotenv()
 
@@ -19,68 +29,160 @@ intents.message_content = True
 intents.members = True
 intents.invites = True
 
+# --- BOT ---
+
+class GatedCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Slash commands wait for the boot pipeline; on timeout they run anyway
+        await wait_until_ready()
+        return True
+
+
+class R7Bot(commands.Bot):
+    async def setup_hook(self):
+        """Boot pipeline: runs once per process, after login and before the gateway connects."""
+        timings = {}
+
+        # 1. Check Database Connection
+        phase_start = time.perf_counter()
+        if db is None:
+            print("❌ MongoDB Connection Failed (Check .env and MONGO_URI)")
+        elif await ping_database():
+            await ensure_indexes()
+        # Helpers already no-op without a DB, so the gate opens either way
+        DB_READY.set()
+        timings["db"] = time.perf_counter() - phase_start
+
+        # 2. The brawler roster loads itself on first use (features/brawl/brawlers.py)
+
+        # 3 + 4. Load Features (Cogs) and Tourney System
+        timings.update(await load_features())
+        print(f"⏱️ Timing {instrument_listeners(self)} event listeners")
+
+        # 5. Warm caches (cogs that need it expose warm_up())
+        phase_start = time.perf_counter()
+        await warm_caches()
+        CACHES_READY.set()
+        timings["caches"] = time.perf_counter() - phase_start
+
+        # 6. SYNC COMMANDS (Do this LAST)
+        phase_start = time.perf_counter()
+        try:
+            # This registers /shop, /buy, /tourney, /audit_emojis etc.
+            # (skipped when nothing changed since the last sync)
+            await sync_commands_if_changed()
+        except Exception as e:
+            print(f"⚠️ Command Sync Error: {e}")
+        timings["sync"] = time.perf_counter() - phase_start
+
+        print_startup_report(timings)
+        print("🚀 Bot Startup Complete!")
+
+    async def on_message(self, message: discord.Message):
+        # Prefix commands wait until the bot is fully booted
+        if not await wait_until_ready():
+            return
+        await self.process_commands(message)
+
+
 # Initialize Bot
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = R7Bot(command_prefix="!", intents=intents, tree_cls=GatedCommandTree)
 
-# --- EVENTS ---
+# Cogs are independent of each other, so their setup() calls run concurrently
+EXTENSIONS = [
+    ("features.general", "General"),
+    ("features.economy", "Economy"),
+    ("features.event", "Event"),
+    ("features.security", "Security (Hacked)"),
+    ("features.brawl.commands", "Brawl (Drops)"),
+    ("features.quests", "Quests"),
+    ("features.translation", "Translation"),
+    ("features.perf", "Perf"),
+]
 
-@bot.event
-async def on_ready():
-    print(f"✅ Logged in as {bot.user}")
-    
-    # 1. Check Database Connection
-    if db is not None:
-        print("✅ MongoDB Connected via 'database.mongo'")
-    else:
-        print("❌ MongoDB Connection Failed (Check .env and MONGO_URI)")
+# --- STARTUP ORCHESTRATOR ---
 
-    # 2. Load Features (Cogs)
+async def load_extension_timed(name: str, label: str):
+    """Imports and registers a cog. Returns (label, seconds, error)."""
+    start = time.perf_counter()
     try:
-        # Load General Feature
-        await bot.load_extension("features.general")
-        print("✅ Loaded Feature: General")
-        
-        await bot.load_extension("features.economy")
-        print("✅ Loaded Feature: Economy")
-        
-        await bot.load_extension("features.event")
-        print("✅ Loaded Feature: Event")
-
-        # Load Security/Hacked Feature
-        await bot.load_extension("features.security")
-        print("✅ Loaded Feature: Security (Hacked)")
-        
-        await bot.load_extension("features.brawl.commands")
-        print("✅ Loaded Feature: Brawl (Drops)")
-        
-        # Load Quests Feature
-        await bot.load_extension("features.quests")
-        print("✅ Loaded Feature: Quests")
-        
-        # Load Translation Feature
-        await bot.load_extension("features.translation")
-        print("✅ Loaded Feature: Translation")
-        
+        # Imports run on the event loop: cogs share modules (config, database),
+        # and importing them from several threads at once risks import-lock
+        # deadlocks and half-initialised modules. Heavy data (the roster) loads lazily.
+        await bot.load_extension(name)
+        return label, time.perf_counter() - start, None
     except Exception as e:
-        print(f"❌ Error loading features: {e}")
+        return label, time.perf_counter() - start, e
+
+async def load_features() -> dict:
+    """Loads every cog concurrently and returns per-phase timings."""
+    timings = {}
 
-    # 3. Load Tourney System
+    phase_start = time.perf_counter()
+    results = await asyncio.gather(*(load_extension_timed(name, label) for name, label in EXTENSIONS))
+    for label, elapsed, error in results:
+        if error is None:
+            print(f"✅ Loaded Feature: {label} ({elapsed * 1000:.0f}ms)")
+        else:
+            print(f"❌ Error loading {label}: {error}")
+    timings["cogs"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
     try:
         setup_tourney_commands(bot)
         print("✅ Loaded Feature: Tournaments")
-        
     except Exception as e:
         print(f"⚠️ Tourney Error: {e}")
+    timings["tourney"] = time.perf_counter() - phase_start
 
-    # 4. SYNC COMMANDS (Do this LAST)
-    try:
-        # This registers /shop, /buy, /tourney, /audit_emojis etc.
-        synced = await bot.tree.sync()
-        print(f"✅ Slash Commands Synced: {len(synced)} commands available")
-    except Exception as e:
-        print(f"⚠️ Command Sync Error: {e}")
+    return timings
+
+async def warm_caches():
+    """Runs every loaded cog's warm_up() (plus shared caches) concurrently."""
+    warmers = [cog.warm_up() for cog in bot.cogs.values() if hasattr(cog, "warm_up")]
+    warmers.append(load_blacklist_cache())
+    warmers.append(load_active_session())
+    warmers.append(load_channel_remap())
+    results = await asyncio.gather(*warmers, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"⚠️ Cache warm-up failed: {result}")
+
+def command_tree_fingerprint() -> str:
+    """Stable hash of every global command payload Discord would receive on sync."""
+    payload = sorted(
+        (cmd.to_dict(bot.tree) for cmd in bot.tree.get_commands()),
+        key=lambda c: (c.get("type", 1), c["name"])
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+async def sync_commands_if_changed():
+    """Only calls tree.sync() when the command tree differs from the last synced one."""
+    setting_key = f"command_tree_hash:{bot.user.id}"
+    fingerprint = command_tree_fingerprint()
 
-    print("🚀 Bot Startup Complete!")
+    if os.getenv("FORCE_COMMAND_SYNC", "").lower() not in ("1", "true", "yes"):
+        if await get_setting(setting_key) == fingerprint:
+            print(f"✅ Slash Commands unchanged ({len(bot.tree.get_commands())} commands), skipping sync")
+            return
+
+    synced = await bot.tree.sync()
+    await set_setting(setting_key, fingerprint)
+    print(f"✅ Slash Commands Synced: {len(synced)} commands available")
+
+def print_startup_report(timings: dict):
+    total = sum(timings.values())
+    print("⏱️ Startup timings:")
+    for phase, elapsed in timings.items():
+        print(f"   {phase:<8} {elapsed * 1000:8.0f}ms")
+    print(f"   {'total':<8} {total * 1000:8.0f}ms")
+
+# --- EVENTS ---
+
+@bot.event
+async def on_ready():
+    # Setup lives in R7Bot.setup_hook; this fires again on every reconnect
+    print(f"✅ Logged in as {bot.user}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,26 @@
+import asyncio
+import os
+
+os.environ.setdefault("DB_BACKEND", "memory")
+
+import features.tourney.tourney_utils as tu
+
+
+def test_failed_load_is_retried(monkeypatch):
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("db down")
+        return [{"_id": "1", "alts": ["2"]}]
+
+    monkeypatch.setattr(tu, "get_all_blacklisted_users", flaky)
+    monkeypatch.setattr(tu, "_blacklist_loaded", False)
+
+    asyncio.run(tu.load_blacklist_cache())
+    assert tu._blacklist_loaded is False
+
+    asyncio.run(tu.load_blacklist_cache())
+    assert tu._blacklist_loaded is True
+    assert tu.lookup_blacklist(2)[0]["_id"] == "1"
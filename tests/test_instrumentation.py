@@ -0,0 +1,44 @@
+import asyncio
+
+from database.instrumentation import get_stats, instrument, reset_stats
+from database.memory import MemoryClient
+from database.instrumentation import InstrumentedDatabase
+
+
+def test_reset_then_one_call_counts_one():
+    @instrument
+    async def sample_helper():
+        return 1
+
+    async def run():
+        for _ in range(5):
+            await sample_helper()
+        assert get_stats()["sample_helper"].calls == 5
+
+        reset_stats()
+        await sample_helper()
+        assert get_stats()["sample_helper"].calls == 1
+
+    asyncio.run(run())
+
+
+def test_swallowed_query_failure_counts_as_error():
+    db = InstrumentedDatabase(MemoryClient()["test"])
+
+    @instrument
+    async def swallowing_helper():
+        try:
+            # Unsupported operator -> the query raises inside the helper
+            await db.things.find_one({"n": {"$regex": "x"}})
+        except Exception:
+            return None
+
+    async def run():
+        reset_stats()
+        await db.things.insert_one({"n": "x"})
+        await swallowing_helper()
+        stats = get_stats()["swallowing_helper"]
+        assert stats.calls == 1
+        assert stats.errors == 1
+
+    asyncio.run(run())
@@ -0,0 +1,30 @@
+import os
+
+os.environ.setdefault("DB_BACKEND", "memory")
+
+from features.tourney.tourney_commands import QUEUE_BARS, format_queue_timeline
+
+
+def bars_of(rendered: str) -> str:
+    return rendered.split("`")[1]
+
+
+def test_negative_depths_render_as_empty_bars():
+    series = {
+        "2026-01-01T10:00": {"max": 4, "last": 4},
+        "2026-01-01T10:01": {"max": -2, "last": -2},
+        "2026-01-01T10:02": {"max": 0, "last": 0},
+    }
+    rendered = format_queue_timeline(series)
+    assert bars_of(rendered) == QUEUE_BARS[-1] + QUEUE_BARS[0] + QUEUE_BARS[0]
+    assert rendered.endswith("peak 4")
+
+
+def test_all_zero_or_negative_series_renders_flat():
+    series = {
+        "2026-01-01T10:00": {"max": 0, "last": 0},
+        "2026-01-01T10:01": {"max": -1, "last": -1},
+    }
+    rendered = format_queue_timeline(series)
+    assert bars_of(rendered) == QUEUE_BARS[0] * 2
+    assert rendered.endswith("peak 0")
@@ -0,0 +1,34 @@
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+os.environ.setdefault("DB_BACKEND", "memory")
+
+import features.tourney.tourney_utils as tu
+
+
+def test_denied_rename_does_not_use_up_the_window():
+    tu._recent_renames.pop(1, None)
+    assert tu._take_rename_slot(1)
+    assert tu._take_rename_slot(1)
+    assert not tu._take_rename_slot(1)
+    assert not tu._take_rename_slot(1)
+    assert len(tu._recent_renames[1]) == tu._RENAME_LIMIT
+
+
+def test_rename_stays_out_of_the_state_edit_and_only_latest_is_sent():
+    channel = MagicMock(id=2, category_id=None)
+    channel.name = "「❗」ticket-001"
+    channel.edit = AsyncMock()
+    category = MagicMock(id=10)
+
+    async def run():
+        await tu.apply_ticket_state(channel, reason="close", category=category, name="「👍」ticket-001")
+        await tu.apply_ticket_state(channel, reason="reopen", name="「❗」ticket-002")
+        await tu._rename_tasks[channel.id]
+
+    tu._recent_renames.pop(2, None)
+    asyncio.run(run())
+    calls = channel.edit.await_args_list
+    assert "name" not in calls[0].kwargs and calls[0].kwargs["category"] is category
+    assert [c.kwargs["name"] for c in calls if "name" in c.kwargs] == ["「❗」ticket-002"]